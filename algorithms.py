@@ -1,22 +1,32 @@
-
-import pygame
 import time
-import random
-import numpy as np
-import sys
+import heapq
+
+import engines
+from disjoint_set import DisjointSet
+from frontier import Frontier
+from maze_core import UP, DOWN, LEFT, RIGHT, DIRECTIONS, Maze
+from solver import Solver, solve
 
 # Sub class for the maze generating algoirthms
 class Algorithm:
     def __init__(self, maze_gen):
         self.maze = maze_gen
-        self.WINDOW = self.maze.WINDOW
-
-        self.wait_time = self.maze.wait_time
-        self.cell_size = self.maze.cell_size
-        self.half_c_size = self.cell_size//2
-        # Line for the path through the maze
-        self.line_width = self.cell_size - (2*((self.cell_size//2)-1))
-
+        # None when the maze is generated headless
+        self.renderer = self.maze.renderer
+        # EventLog the generation is recorded to, when it's to be played back afterwards
+        self.log = self.maze.log
+        # Headless and recorded runs use the integer index engines, as there's nothing to animate as it goes
+        self.use_engine = self.renderer is None or self.log is not None
+        # The maze's random number stream, the same seed always gives the same maze
+        self.rng = self.maze.rng
+        # RunStats the counts and timings of each run are added to
+        self.stats = self.maze.stats
+
+        # Pause after each step, only when the window isn't paced
+        self.wait_time = self.maze.wait_time or 0
+
+    # Sets up the Cell based state at the start of a run, the grid is only built once an algorithm asks for it
+    def setup(self):
         self.grid = self.maze.grid
         # The line through the maze is drawn from the exit to the entry
         self.entry = self.grid[0, 0]
@@ -24,121 +34,126 @@ class Algorithm:
         # current is the cell currently being considered
         self.current = self.entry
         self.current.been_visited()
-        # Keeps track of which cell each cell came from
-        self.solution = {}
+        self.stats.cells_visited += 1
 
     def display_and_wait(self):
-        pygame.display.update()
-        time.sleep(self.wait_time)
+        self.update_display()
+        self.wait()
+
+    def wait(self):
+        if self.wait_time:
+            start = time.perf_counter()
+            time.sleep(self.wait_time)
+            self.stats.sleep_time += time.perf_counter() - start
+
+    def update_display(self):
+        if self.renderer is not None:
+            self.renderer.update()
+
+    def set_caption(self, caption):
+        if self.renderer is not None:
+            self.renderer.set_caption(caption)
+
+    # Runs the whole algorithm. Without a window there's nothing to animate, so the integer index engine is used,
+    # otherwise the Cell based steps are run by the maze's pacer, a number of them each frame. Without a pacer they
+    # are run straight through, checking if the window has been closed in between.
+    def run(self):
+        if self.use_engine:
+            self.run_engine()
+            return
+        if self.maze.pacer is not None:
+            self.maze.pacer.run(self.steps())
+            return
+        for _ in self.steps():
+            self.check_closed()
+
+    # Each sub class has a run_engine method, which runs its engine on the maze, and a steps method. steps is a
+    # generator which does one step of the Cell based algorithm, drawing included, every time it's advanced, so
+    # other code can run between steps or stop the algorithm part way through by closing the generator.
 
     # Sees if the window has been closed
     def check_closed(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sys.exit()
+        if self.renderer is not None:
+            start = time.perf_counter()
+            self.renderer.check_closed()
+            self.stats.event_time += time.perf_counter() - start
 
-    # Draws a path through the whole maze
+    # Draws a path through the whole maze, one step per segment of the path
     def path_through(self):
-        def path_line_up(x, y, colour):
-            pygame.draw.rect(self.WINDOW, colour, (x+self.half_c_size, y+self.half_c_size-self.cell_size, self.line_width, self.cell_size), 0)
-            pygame.display.update()
-        
-        def path_line_down(x, y, colour):
-            pygame.draw.rect(self.WINDOW, colour, (x+self.half_c_size, y+self.half_c_size, self.line_width, self.cell_size), 0)
-            pygame.display.update()
-
-        def path_line_left(x, y, colour):
-            pygame.draw.rect(self.WINDOW, colour, (x+self.half_c_size-self.cell_size, y+self.half_c_size, self.cell_size+self.line_width, self.line_width), 0)
-            pygame.display.update()
-
-        def path_line_right(x, y, colour):
-            pygame.draw.rect(self.WINDOW, colour, (x+self.half_c_size, y+self.half_c_size, self.cell_size+self.line_width, self.line_width), 0)
-            pygame.display.update()
-
-        x = self.exit.x
-        y = self.exit.y
-        i = 0
-
-        # Originally goes through the path to check the length
-        while (x, y) != (self.entry.x, self.entry.y):
-            self.check_closed()
-            i += 1
-            x, y = self.solution[x,y]
+        # Nothing to draw on when headless
+        if self.renderer is None:
+            return
+
+        maze = self.maze.maze
+        if self.maze.solver is None:
+            # The line is drawn from the exit back to the entry, with the path found from the wall array
+            path = Solver(maze, self.exit.index).path(self.entry.index)
+        else:
+            # The chosen solver's search is shown first, one expanded cell per step
+            result = solve(maze, self.maze.solver, self.entry.index, self.exit.index)
+            for cell in result['expanded'].tolist():
+                yield
 
-        x = self.exit.x
-        y = self.exit.y
+                self.renderer.search_cell(*maze.position(cell))
+                self.display_and_wait()
+            if result['path'] is None:
+                return
+            path = result['path'][::-1]
+        i = len(path) - 1
+        if i == 0:
+            return
 
         # Starts red and fades into yellow
         colour = (255, 0, 0)
         green_value = 0
 
-        counter = 0
-        gradient_quotient = 0
-
         # Creates a gradiented line from red to yellow, with the gradient dependent on the length of the path
         if i <= 255:
             gradient_quotient = 255//i
-            while (x, y) != (self.entry.x, self.entry.y):
-                self.check_closed()
-
-                if self.solution[x, y][0] > x:
-                    path_line_right(x, y, colour)
-                if self.solution[x, y][0] < x:
-                    path_line_left(x, y, colour)
-                if self.solution[x, y][1] < y:
-                    path_line_up(x, y, colour)
-                if self.solution[x, y][1] > y:
-                    path_line_down(x, y, colour)
-
-                x, y = self.solution[x, y]
-                time.sleep(self.wait_time)
-                green_value += gradient_quotient
-                colour = (255, green_value, 0)
-
+            colour_change_const = 1
         else:
             gradient_quotient = 1
             colour_change_const = ((i//255)+1)
-            while (x, y) != (self.entry.x, self.entry.y):
-                self.check_closed()
-
-                counter += 1
-                if self.solution[x, y][0] > x:
-                    path_line_right(x, y, colour)
-                if self.solution[x, y][0] < x:
-                    path_line_left(x, y, colour)
-                if self.solution[x, y][1] < y:
-                    path_line_up(x, y, colour)
-                if self.solution[x, y][1] > y:
-                    path_line_down(x, y, colour)               
-
-                x, y = self.solution[x, y] 
-                time.sleep(self.wait_time)
-                if counter % colour_change_const == 0:
-                    green_value += gradient_quotient
-                    colour = (255, green_value, 0)
+
+        for counter in range(1, i+1):
+            yield
+
+            row, col = maze.position(int(path[counter-1]))
+            next_row, next_col = maze.position(int(path[counter]))
+            x = self.renderer.cell_x(col)
+            y = self.renderer.cell_y(row)
+            self.renderer.path_line(x, y, maze.direction_between(row, col, next_row, next_col), colour)
+
+            self.wait()
+            if counter % colour_change_const == 0:
+                green_value += gradient_quotient
+                colour = (255, green_value, 0)
 
 
 # The algoirthm finds a random walk from a starting point, and once the walk has no where to go, you backtrack until
 # you find a cell in which you can do another walk from.
 class DepthFirst(Algorithm):
-    def __init__(self, maze_gen):
-        Algorithm.__init__(self, maze_gen)
+    def setup(self):
+        Algorithm.setup(self)
 
-        # Stack needed for backtracking
-        self.stack = np.empty((0,1))
-        self.stack = np.append(self.stack, self.current)  
+        # Stack needed for backtracking, a list so pushing and popping don't copy the whole stack
+        self.stack = [self.current]
 
-    def run(self):
-        pygame.display.set_caption("Python Maze Generator (Depth First Search)")
-        while self.stack.size > 0:
-            self.check_closed()
+    def run_engine(self):
+        engines.depth_first(self.maze.maze, rng=self.rng, log=self.log, stats=self.stats)
 
-            time.sleep(self.wait_time)
+    def steps(self):
+        self.setup()
+        self.set_caption("Python Maze Generator (Depth First Search)")
+        while len(self.stack) > 0:
+            yield
+
+            self.wait()
             unvisited_neighbours = self.current.grab_unvisited_neighbours()
 
             # Chooses random direction to walk in if viable
             if len(unvisited_neighbours) > 0:
-                chosen_neighbour = random.choice(unvisited_neighbours)
+                chosen_neighbour = self.rng.choice(unvisited_neighbours)
 
                 if chosen_neighbour.row > self.current.row:
                     self.current.open_down()
@@ -152,96 +167,153 @@ class DepthFirst(Algorithm):
                 if chosen_neighbour.col < self.current.col:
                     self.current.open_left()
 
-                pygame.display.update()
-                self.solution[(chosen_neighbour.x, chosen_neighbour.y)] = self.current.x, self.current.y
+                self.update_display()
                 self.current = chosen_neighbour
                 self.current.been_visited()
-                self.stack = np.append(self.stack, self.current)
+                self.stats.cells_visited += 1
+                self.stack.append(self.current)
 
             # If there's nowhere to walk, the cell flashes red and there's a backtrack
             else:
+                self.stack.pop()
+                self.stats.backtracks += 1
+                if not self.stack:
+                    break
                 self.current = self.stack[-1]
-                self.stack = self.stack[:-1]
 
                 self.current.show_cell()
-                pygame.display.update()
-                time.sleep(self.wait_time)
+                self.update_display()
+                self.wait()
                 self.current.cover_cell()
-                pygame.display.update()
+                self.update_display()
 
         # Shows path through the maze once it's created
-        self.path_through()
+        yield from self.path_through()
 
 # Adds a cell to a maze and then randomly joins an adjacent cell to the maze. Another cell adjacent to the current
 # maze is then joined to the maze, and this is repeated until the maze is complete.
 class Primms(Algorithm):
-    def __init__(self, maze_gen):
+    def __init__(self, maze_gen, weighted=False):
         Algorithm.__init__(self, maze_gen)
 
-        # Array of cells which are adjacent to already visited cells
-        self.considering = np.empty((0,1))    
+        # Weighted mode gives each edge a random weight and always carves the lightest one (true randomised Prim's)
+        self.weighted = weighted
 
-    def run(self):
-        pygame.display.set_caption("Pyhton Maze Generator (Primm's Algorithm)")
+    def setup(self):
+        Algorithm.setup(self)
+
+        # Indices of cells which are adjacent to already visited cells
+        self.considering = Frontier(self.maze.maze.size)
+        # Heap of (weight, cell index, side of the cell facing the maze) used by the weighted mode
+        self.edges = []
+
+    def run_engine(self):
+        if self.weighted:
+            engines.weighted_primms(self.maze.maze, rng=self.rng, log=self.log, stats=self.stats)
+        else:
+            engines.primms(self.maze.maze, rng=self.rng, log=self.log, stats=self.stats)
+
+    def steps(self):
+        self.setup()
+        if self.weighted:
+            self.set_caption("Python Maze Generator (Weighted Primm's Algorithm)")
+            yield from self.run_weighted()
+        else:
+            self.set_caption("Pyhton Maze Generator (Primm's Algorithm)")
+            yield from self.run_random()
+
+        yield from self.path_through()
+
+    # Joins the cell to the visited neighbour
+    def join(self, neighbour):
+        if neighbour.row > self.current.row:
+            self.current.open_down()
+
+        if neighbour.row < self.current.row:
+            self.current.open_up()
+
+        if neighbour.col > self.current.col:
+            self.current.open_right()
+
+        if neighbour.col < self.current.col:
+            self.current.open_left()
+
+
+    def run_random(self):
         self.current.show_cell()
 
-        # Finds all adjacent cells and adds them to the 'considering' array
-        self.considering = np.array(self.current.grab_unvisited_neighbours())
-        for cell in self.considering:
+        # Finds all adjacent cells and adds them to the 'considering' set
+        for cell in self.current.grab_unvisited_neighbours():
+            self.considering.add(cell.index)
             cell.show_cell()
-        pygame.display.update()
+        self.update_display()
 
-        while self.considering.size > 0:
-            self.check_closed()
+        while len(self.considering) > 0:
+            yield
 
-            time.sleep(self.wait_time)
+            self.wait()
 
-            # Picks a random cell from 'considering', and joins it to a visited cell
-            self.current = random.choice(self.considering)
+            # Picks and removes a random cell from 'considering', and joins it to a visited cell
+            self.current = self.grid.flat[self.considering.pop_random(self.rng.random)]
             self.current.been_visited()
+            self.stats.cells_visited += 1
             visited_neighbours = self.current.grab_visited_neighbours()
 
-            chosen_neighbour = random.choice(visited_neighbours)
+            self.join(self.rng.choice(visited_neighbours))
 
-            if chosen_neighbour.row > self.current.row:
-                self.current.open_down()
+            # Adds neighbours of the newly joined cell to the 'considering' set if the cell is not being currently considered
+            unvisited_neighbours = self.current.grab_unvisited_neighbours()
+            for neighbour in unvisited_neighbours:
+                if neighbour.index not in self.considering:
+                    neighbour.show_cell()
+                    self.considering.add(neighbour.index)
 
-            if chosen_neighbour.row < self.current.row:
-                self.current.open_up()
+            self.update_display()
 
-            if chosen_neighbour.col > self.current.col:
-                self.current.open_right()
+    # Adds an edge from the current cell to each of its unvisited neighbours. The weights are 30 bit ints and equal
+    # weights go by the cell and then the index of its side in DIRECTIONS, the same order as the engine's packed
+    # edges, so both carve the same edges.
+    def push_edges(self):
+        for neighbour in self.current.grab_unvisited_neighbours():
+            neighbour.show_cell()
+            side = Maze.direction_between(neighbour.row, neighbour.col, self.current.row, self.current.col)
+            weight = int(self.rng.random() * (1 << 30))
+            heapq.heappush(self.edges, (weight, neighbour.index, DIRECTIONS.index(side)))
 
-            if chosen_neighbour.col < self.current.col:
-                self.current.open_left()
+    def run_weighted(self):
+        self.current.show_cell()
+        self.push_edges()
+        self.update_display()
 
-            self.solution[(self.current.x, self.current.y)] = chosen_neighbour.x, chosen_neighbour.y
-            # Adds neighbours of the newly joined cell to the 'considering' array if the cell is not being currently considered
-            unvisited_neighbours = self.current.grab_unvisited_neighbours()
-            for neighbour in unvisited_neighbours:
-                if neighbour not in self.considering:
-                    neighbour.show_cell()
-                    self.considering = np.append(self.considering, neighbour)
+        while len(self.edges) > 0:
+            yield
 
-            # Deletes the newly added cell from 'considering'
-            delete_array = np.where(self.current == self.considering)
-            delete_index = delete_array[0]
-            self.considering = np.delete(self.considering, delete_index)
+            # Carves the lightest edge, unless the cell at its end has been joined since it was added
+            weight, cell_index, side = heapq.heappop(self.edges)
+            self.current = self.grid.flat[cell_index]
+            if self.current.visited:
+                continue
 
-            pygame.display.update()
+            self.wait()
 
-        self.path_through()
+            self.current.been_visited()
+            self.stats.cells_visited += 1
+            self.current.open_side(DIRECTIONS[side])
+            self.push_edges()
+
+            self.update_display()
 
 
 # Goes from the uppermost furthest left cell and adds a cell to the right to complete the top row
 # Afterward, each cell added, going from left to right, top to bottom, either carves a path upwards
 # or to the left, until the maze is complete.
 class BinaryTree(Algorithm):
-    def __init__(self, maze_gen):
-        Algorithm.__init__(self, maze_gen)
+    def run_engine(self):
+        engines.binary_tree(self.maze.maze, rng=self.rng, log=self.log, stats=self.stats)
 
-    def run(self):
-        pygame.display.set_caption("Python Maze Generator (Binary Tree Algorithm)")
+    def steps(self):
+        self.setup()
+        self.set_caption("Python Maze Generator (Binary Tree Algorithm)")
 
         # Fills the first cell
         self.current.show_cell()
@@ -250,53 +322,58 @@ class BinaryTree(Algorithm):
 
         # Fills the remaining section of the top row 
         for cell in self.grid[0, 1:]:
-            self.check_closed()
+            yield
 
             self.current = cell
+            self.stats.cells_visited += 1
             self.current.show_cell()
             self.display_and_wait()
             self.current.open_left()
 
-            self.solution[(self.current.x, self.current.y)] = self.current.x - self.cell_size, self.current.y
 
-        # Fills the remaining rows  
-        for row in self.grid[1:]:
-            self.current = row[0]
-
-            # First cell of each row can only carve upwards
-            self.current.show_cell()
-            self.display_and_wait()
-            self.current.open_up()
-            self.display_and_wait()    
+        # Fills the remaining rows, with which way each cell carves drawn in the same blocks of rows as the engine
+        rows, cols = self.grid.shape
+        for top in range(1, rows, engines.BLOCK_ROWS):
+            bottom = min(top + engines.BLOCK_ROWS, rows)
+            carves_up = engines.binary_tree_block(self.rng.generator, bottom - top, cols).tolist()
+            for row, row_up in zip(self.grid[top:bottom], carves_up):
+                self.current = row[0]
+                self.stats.cells_visited += 1
 
-            self.solution[(self.current.x, self.current.y)] = self.current.x, self.current.y - self.cell_size
+                # First cell of each row can only carve upwards
+                self.current.show_cell()
+                self.display_and_wait()
+                self.current.open_up()
+                self.display_and_wait()    
 
-            for cell in row[1:]:
-                self.check_closed()
 
-                self.current = cell
+                for cell, up in zip(row[1:], row_up[1:]):
+                    yield
 
-                self.current.show_cell()
-                self.display_and_wait()
+                    self.current = cell
+                    self.stats.cells_visited += 1
 
-                direction = random.randrange(2)
+                    self.current.show_cell()
+                    self.display_and_wait()
 
-                if direction == 0:
-                    self.current.open_up()
-                    self.solution[(self.current.x, self.current.y)] = self.current.x, self.current.y - self.cell_size
-                else:
-                    self.current.open_left()
-                    self.solution[(self.current.x, self.current.y)] = self.current.x - self.cell_size, self.current.y
-        pygame.display.update()
+                    if up:
+                        self.current.open_up()
+                    else:
+                        self.current.open_left()
+        self.update_display()
 
-        self.path_through()
+        yield from self.path_through()
 
 
 # Creates a random walk from the top left cell and when the walk comes to an end, another walk is started from the first 
 # cell possible, when looking from left to right, top to bottom on the maze.
 class HuntAndKill(Algorithm):
-    def __init__(self, maze_gen):
-        Algorithm.__init__(self, maze_gen)
+    def setup(self):
+        Algorithm.setup(self)
+
+        # Number of unvisited cells in each row, lets the hunt skip rows with nothing left to walk to
+        self.row_unvisited = [self.grid.shape[1]] * self.grid.shape[0]
+        self.row_unvisited[self.current.row] -= 1
 
         # A generator and its initial position
         self.h = self.hunt()
@@ -305,24 +382,31 @@ class HuntAndKill(Algorithm):
     # The generator goes through positions left to right, top to bottom on the maze
     def hunt(self):
         for i in range(self.grid.shape[0]):
+            # A cell can only be walked from if it or a cell above or below it is unvisited
+            if not any(self.row_unvisited[max(i-1, 0):i+2]):
+                continue
             for j in range(self.grid.shape[1]):
                 yield (i, j)
         # Yields an invalid position once the maze is complete
         yield -1
 
-    def run(self):
-        pygame.display.set_caption("Python Maze Generator (Hunt and Kill Algorithm)")
+    def run_engine(self):
+        engines.hunt_and_kill(self.maze.maze, rng=self.rng, log=self.log, stats=self.stats)
+
+    def steps(self):
+        self.setup()
+        self.set_caption("Python Maze Generator (Hunt and Kill Algorithm)")
 
         # Until the generator is on its final value
         while self.hunt_pos != -1:
-            self.check_closed()
+            yield
 
             # Performs random walk
-            time.sleep(self.wait_time)
+            self.wait()
             unvisited_neighbours = self.current.grab_unvisited_neighbours()
 
             if len(unvisited_neighbours) > 0:
-                chosen_neighbour = random.choice(unvisited_neighbours)
+                chosen_neighbour = self.rng.choice(unvisited_neighbours)
 
                 if chosen_neighbour.row > self.current.row:
                     self.current.open_down()
@@ -336,10 +420,11 @@ class HuntAndKill(Algorithm):
                 if chosen_neighbour.col < self.current.col:
                     self.current.open_left()
 
-                pygame.display.update()
-                self.solution[(chosen_neighbour.x, chosen_neighbour.y)] = self.current.x, self.current.y
+                self.update_display()
                 self.current = chosen_neighbour
                 self.current.been_visited()
+                self.stats.cells_visited += 1
+                self.row_unvisited[self.current.row] -= 1
 
             # If no available position, walk from the last 'hunting' position
             else:
@@ -348,95 +433,87 @@ class HuntAndKill(Algorithm):
                 self.display_and_wait()
 
                 self.current.cover_cell()
-                pygame.display.update()
+                self.update_display()
 
                 unvisited_neighbours = self.current.grab_unvisited_neighbours()
                 # If the hunting position isn't available, use the next one
                 if len(unvisited_neighbours) == 0:
                     self.hunt_pos = next(self.h)
+                    self.stats.hunt_steps += 1
 
-        self.path_through()
+        yield from self.path_through()
 
 
 # Connects cells horizontally into a 'run set'. Randomly chooses whether to continue the run set or to carve upwards
 # on a random cell in the run set, which creates a new set, which becomes the current runnning set.
 class Sidewinder(Algorithm):
-    def __init__(self, maze_gen):
-        Algorithm.__init__(self, maze_gen)
-
-        self.run_set = np.empty((0,1))
-
-    # Chooses random cell in the run set and carves upwards
-    def carve_north(self):
-        chosen_cell = random.choice(self.run_set)
+    # Carves upwards from the cell chosen from the run set
+    def carve_north(self, chosen_cell):
         chosen_cell.show_cell()
         self.display_and_wait()
         chosen_cell.open_up()
-        self.solution[(chosen_cell.x, chosen_cell.y)] = chosen_cell.x, chosen_cell.y - self.cell_size
 
-        for cell in self.run_set:
-            self.check_closed()
+    def run_engine(self):
+        engines.sidewinder(self.maze.maze, rng=self.rng, log=self.log, stats=self.stats)
 
-            # Redirects the 'solution' of the cells in the run set towards the cell which carved upwards
-            if cell.col < chosen_cell.col:
-                self.solution[(cell.x, cell.y)] = cell.x + self.cell_size, cell.y
-
-    def run(self):
-        pygame.display.set_caption("Python Maze Generator (Sidewinder Algorithm)")
+    def steps(self):
+        self.setup()
+        self.set_caption("Python Maze Generator (Sidewinder Algorithm)")
 
         # Carves to the right along the entire top row
         for cell in self.grid[0, :-1]:
-            self.check_closed()
+            yield
 
             self.current = cell
             self.current.show_cell()
             self.display_and_wait()
             self.current.open_right()
 
-            self.solution[(self.current.x + self.cell_size, self.current.y)] = self.current.x, self.current.y
 
         self.current = self.grid[0, -1]
+        # The whole top row, apart from the entry which setup counted
+        self.stats.cells_visited += self.grid.shape[1] - 1
         self.current.show_cell()
         self.display_and_wait()
         self.current.cover_cell()
 
-        # Fills the remaining rows of the maze
-        for row in self.grid[1:]:
-            self.check_closed()
+        # Fills the remaining rows of the maze. Whether each cell carries its run on and the cell each run carves up
+        # from are drawn in the same blocks of rows as the engine, so the same seed gives the same maze.
+        rows, cols = self.grid.shape
+        for top in range(1, rows, engines.BLOCK_ROWS):
+            bottom = min(top + engines.BLOCK_ROWS, rows)
+            east, _, chosen = engines.sidewinder_block(self.rng.generator, bottom - top, cols)
+            block = self.grid[top:bottom].flat
+            run_ups = iter(chosen.tolist())
+            for row, row_east in zip(self.grid[top:bottom], east.tolist()):
+                yield
+
+                for cell, carve_east in zip(row[:-1], row_east):
+                    yield
+                    self.current = cell
+                    self.stats.cells_visited += 1
+
+                    self.current.show_cell()
+                    self.display_and_wait()
+                    self.current.cover_cell()
 
-            for cell in row[:-1]:
-                self.check_closed()
-                self.current = cell
+                    if carve_east:
+                        self.current.open_right()
+                    else:
+                        self.carve_north(block[next(run_ups)])
 
-                carve_east = random.choice([True, True, False])
+                # Always carves north on the last cell of each row
+                self.current = row[-1]    
+                self.stats.cells_visited += 1
 
                 self.current.show_cell()
                 self.display_and_wait()
                 self.current.cover_cell()
 
-                self.run_set = np.append(self.run_set, self.current)
-
-                if carve_east:
-                    self.current.open_right()
-                    self.solution[(self.current.x + self.cell_size, self.current.y)] = self.current.x, self.current.y
-                else:
-                    self.carve_north()
-                    self.run_set = np.empty((0,1))
-
-            # Always carves north on the last cell of each row
-            self.current = row[-1]    
-
-            self.current.show_cell()
-            self.display_and_wait()
-            self.current.cover_cell()
-
-            self.run_set = np.append(self.run_set, self.current)
-
-            self.carve_north()
-            self.run_set = np.empty((0,1))
-            self.display_and_wait()
+                self.carve_north(block[next(run_ups)])
+                self.display_and_wait()
 
-        self.path_through()
+        yield from self.path_through()
 
 
 # Creates cells from left to right, top to bottom. Initialises each cell in its own set and chooses random whether 
@@ -444,82 +521,72 @@ class Sidewinder(Algorithm):
 # each cell from the row randomly carves downwards, with at least one cell from each set carving downwards. 
 # The final row of the maze merges all of the sets together into one.
 class Ellers(Algorithm):
-    def __init__(self, maze_gen):
-        Algorithm.__init__(self, maze_gen)
+    def setup(self):
+        Algorithm.setup(self)
 
         # Eller's itertes over each row twice so this exists to speed up the process
         self.wait_time_multiplier = 1.5
 
-        self.set_dict = {}
-        self.rolling_set_no = 1
+        # Every cell starts in a set of its own, cells are only ever joined to other sets
+        self.sets = DisjointSet(self.maze.maze.size)
         self.current_row = 0
 
-        self.create_new_set()
+    # Whether two cells are in the same set
+    def same_set(self, cell, other):
+        return self.sets.find(cell.index) == self.sets.find(other.index)
 
-    # For when each new cell is created
-    def create_new_set(self):
-        self.current.set = self.rolling_set_no
-        self.set_dict[self.current.set] = {self.current}
-        self.rolling_set_no += 1
+    def merge_sets(self, cell, other):
+        self.stats.set_merges += 1
+        self.sets.union(cell.index, other.index)
 
-    # Merges the newer sets to the older sets instead of the other way around for efficiency 
-    def merge_sets(self, set_num, neighbour_set_num):
-        self.set_dict[neighbour_set_num].update(self.set_dict[set_num])
-
-        for cell in self.set_dict[set_num]:
-            self.check_closed()
-            cell.set = neighbour_set_num
-        del self.set_dict[set_num]
+    # Joins a cell to the one below it, which puts the cell below into the cell's set
+    def join_down(self, cell):
+        cell.open_down()
+        below = self.grid[cell.row + 1, cell.col]
+        below.been_visited()
+        self.sets.union(cell.index, below.index)
 
     # Creates downwards connections in the row, ensuring each set has at least one
     def extend_down(self):
         row = self.grid[self.current_row]
+        # The set of each cell, found before any cell below joins a set
+        labels = [self.sets.find(cell.index) for cell in row]
         # Counts the number of cells of each set in the row
         counter = {}
-        # Tracks if the set has a downwards connection
-        extended = {}
-
-        for cell in row:
-            self.check_closed()
-
-            try:
-                counter[cell.set] += 1
-            except:
-                counter[cell.set] = 1
-                extended[cell.set] = False
+        for label in labels:
+            counter[label] = counter.get(label, 0) + 1
+        # Sets which have a downwards connection
+        extended = set()
 
-        for cell in row:
-            self.check_closed()
+        for cell, label in zip(row, labels):
+            yield
 
             cell.show_cell()
             self.display_and_wait()
 
-            carve_down = random.choice([True, False])
+            carve_down = self.rng.chance(0.5)
             if carve_down:
-                cell.open_down()
-
-                extended[cell.set] = True
-                self.grid[cell.row + 1, cell.col].been_visited()
-                self.grid[cell.row + 1, cell.col].set = cell.set
-                self.set_dict[cell.set].add(self.grid[cell.row + 1, cell.col])
+                self.join_down(cell)
+                extended.add(label)
 
             # if the cell is the last in the set of the row and no cells in the set connected downwards
-            elif counter[cell.set] == 1 and not extended[cell.set] == True:
-                cell.open_down()
-                self.grid[cell.row + 1, cell.col].been_visited()
-                self.grid[cell.row + 1, cell.col].set = cell.set
-                self.set_dict[cell.set].add(self.grid[cell.row + 1, cell.col])
+            elif counter[label] == 1 and label not in extended:
+                self.join_down(cell)
 
             else:
                 cell.cover_cell()
 
-            counter[cell.set] -= 1
+            counter[label] -= 1
             self.display_and_wait()    
 
         self.current_row += 1            
 
-    def run(self):
-        pygame.display.set_caption("Python Maze Generator (Eller's Algorithm)")
+    def run_engine(self):
+        engines.ellers(self.maze.maze, rng=self.rng, log=self.log, stats=self.stats)
+
+    def steps(self):
+        self.setup()
+        self.set_caption("Python Maze Generator (Eller's Algorithm)")
 
         self.wait_time /= self.wait_time_multiplier
 
@@ -531,41 +598,40 @@ class Ellers(Algorithm):
 
         previous = self.current
 
-        # First row, after the first cell
-        for cell in self.grid[0, 1:]:
-            self.check_closed()
+        # First row, after the first cell. A maze of a single row only has the final row, like the engine's.
+        single_row = self.grid.shape[0] == 1
+        if not single_row:
+            for cell in self.grid[0, 1:]:
+                yield
 
-            self.current = cell
-            self.create_new_set()
+                self.current = cell
+                self.stats.cells_visited += 1
 
-            self.current.show_cell()
-            self.display_and_wait()
+                self.current.show_cell()
+                self.display_and_wait()
 
-            merge = random.choice([True, False])
-            if merge:
-                self.current.open_left()
-                self.merge_sets(self.current.set, previous.set)
-            else:
-                self.current.cover_cell()
+                merge = self.rng.chance(0.5)
+                if merge:
+                    self.current.open_left()
+                    self.merge_sets(self.current, previous)
+                else:
+                    self.current.cover_cell()
 
-            self.display_and_wait()
-            previous = self.current
+                self.display_and_wait()
+                previous = self.current
 
-        self.extend_down()
+            yield from self.extend_down()
 
         # Remaining rows up to the final row
         for row in self.grid[1:-1]:
-            self.check_closed()
+            yield
 
             # First cell of row
             self.current = row[0]
+            self.stats.cells_visited += 1
             self.current.show_cell()
             self.display_and_wait()
 
-            # If the cell isn't where a downwards connection was made
-            if not self.current.visited:
-                self.create_new_set()
-            
             self.current.cover_cell()
             self.display_and_wait()
 
@@ -573,20 +639,18 @@ class Ellers(Algorithm):
 
             # Remaining cells of rows
             for cell in row[1:]:
-                self.check_closed()
+                yield
                 self.current = cell
+                self.stats.cells_visited += 1
 
                 self.current.show_cell()
                 self.display_and_wait()
 
-                if not self.current.visited:
-                    self.create_new_set()
-
-                if previous.set != self.current.set:
-                    merge = random.choice([True, False])
+                if not self.same_set(previous, self.current):
+                    merge = self.rng.chance(0.5)
                     if merge:
                         self.current.open_left()
-                        self.merge_sets(self.current.set, previous.set)
+                        self.merge_sets(self.current, previous)
                     else:
                         self.current.cover_cell()
                 else:
@@ -596,38 +660,151 @@ class Ellers(Algorithm):
 
                 previous = self.current
             
-            self.extend_down()
-
-        # Final row
-        self.current = self.grid[-1, 0]
-        self.current.show_cell()
-        self.display_and_wait()
+            yield from self.extend_down()
 
-        if not self.current.visited:
-            self.create_new_set()
+        # Final row, its first cell has already been shown if it's the first row as well
+        if not single_row:
+            self.current = self.grid[-1, 0]
+            self.stats.cells_visited += 1
+            self.current.show_cell()
+            self.display_and_wait()
 
-        self.current.cover_cell()
-        self.display_and_wait()
+            self.current.cover_cell()
+            self.display_and_wait()
 
         previous = self.current
 
         # Remaining cells of the final row
         for cell in self.grid[-1, 1:]:
-            self.check_closed()
+            yield
             self.current = cell
+            self.stats.cells_visited += 1
 
             self.current.show_cell()
             self.display_and_wait()
 
-            if not self.current.visited:
-                self.create_new_set()
-
-            if previous.set != self.current.set:
+            if not self.same_set(previous, self.current):
                 self.current.open_left()
-                self.merge_sets(self.current.set, previous.set)
+                self.merge_sets(self.current, previous)
             else:
                 self.current.cover_cell()
 
             self.display_and_wait()
 
-        self.wait_time *= self.wait_time_multiplier
\ No newline at end of file
+        self.wait_time *= self.wait_time_multiplier
+
+        yield from self.path_through()
+
+
+# Every wall between two cells is considered once, in a random order, and knocked down if the cells either side of
+# it aren't connected yet. The maze grows as many separate pieces, which join up until there's only one left.
+class Kruskals(Algorithm):
+    def setup(self):
+        Algorithm.setup(self)
+
+        # Which cells are connected to which, every cell starts in a set of its own
+        self.sets = DisjointSet(self.maze.maze.size)
+        self.edges = engines.shuffled_edges(self.maze.maze, self.rng)
+
+    def run_engine(self):
+        engines.kruskals(self.maze.maze, rng=self.rng, log=self.log, stats=self.stats)
+
+    # Counts the cell as visited the first time it's joined to another
+    def visit(self, cell):
+        if not cell.visited:
+            cell.been_visited()
+            self.stats.cells_visited += 1
+
+    def steps(self):
+        self.setup()
+        self.set_caption("Python Maze Generator (Kruskal's Algorithm)")
+
+        cells = self.grid.flat
+        cols = self.grid.shape[1]
+        remaining = self.maze.maze.size - 1
+        for edge in self.edges:
+            if not remaining:
+                break
+            yield
+
+            self.current = cells[edge >> 1]
+            neighbour = cells[(edge >> 1) + (cols if edge & 1 else 1)]
+            if not self.sets.union(self.current.index, neighbour.index):
+                continue
+
+            self.current.show_cell()
+            neighbour.show_cell()
+            self.display_and_wait()
+
+            if edge & 1:
+                self.current.open_down()
+            else:
+                self.current.open_right()
+            self.visit(self.current)
+            self.visit(neighbour)
+            self.update_display()
+            remaining -= 1
+
+        yield from self.path_through()
+
+
+# Random walks from each cell outside the maze until the walk reaches the maze, then carves the walk in with its
+# loops erased, which makes every possible maze equally likely. The walk only keeps the way it last left each cell,
+# in the same 'next' array as the engine, so a loop is erased just by walking over it again.
+class Wilsons(Algorithm):
+    def setup(self):
+        Algorithm.setup(self)
+
+        # The maze grows from the middle cell like the engine's, rather than from the entry
+        maze = self.maze.maze
+        self.entry.visited = False
+        self.current = self.grid[maze.rows // 2, maze.cols // 2]
+        self.current.been_visited()
+        self.moves = engines.walk_moves(maze)
+        self.random_side = engines.random_sides(self.rng)
+        self.next_side = bytearray(maze.size)
+
+    def run_engine(self):
+        engines.wilsons(self.maze.maze, rng=self.rng, log=self.log, stats=self.stats)
+
+    def steps(self):
+        self.setup()
+        self.set_caption("Python Maze Generator (Wilson's Algorithm)")
+        self.current.cover_cell()
+
+        cells = self.grid.flat
+        moves = self.moves
+        next_side = self.next_side
+        sides = (UP, DOWN, LEFT, RIGHT)
+        for first in range(self.maze.maze.size):
+            if cells[first].visited:
+                continue
+
+            # Each step of the walk flashes the cell it reaches
+            cell = first
+            for side in self.random_side:
+                yield
+
+                next_side[cell] = side
+                cell = moves[cell << 2 | side]
+                self.current = cells[cell]
+                self.current.show_cell()
+                self.display_and_wait()
+                if self.current.visited:
+                    self.current.cover_cell()
+                    break
+                self.current.clear_cell()
+
+            # Then the loop-erased walk is carved into the maze
+            cell = first
+            while not cells[cell].visited:
+                yield
+
+                self.current = cells[cell]
+                self.current.open_side(sides[next_side[cell]])
+                self.current.been_visited()
+                self.stats.cells_visited += 1
+                self.display_and_wait()
+                cell = moves[cell << 2 | next_side[cell]]
+
+        yield from self.path_through()
\ No newline at end of file
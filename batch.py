@@ -0,0 +1,103 @@
+import argparse
+import struct
+import sys
+import time
+
+from maze_core import pack_walls, unpack_walls, packed_size
+from maze_generator import MazeGenerator
+from options import positive_int
+from parallel import map_jobs, process_count
+
+# A batch file is a header followed by one fixed size record per maze, so it can be written as the mazes arrive
+# and read back without an index.
+#   header: b'MAZEBAT1', rows (uint32), cols (uint32), length of the algorithm name (uint16), name (utf-8)
+#   record: seed (int64), then the walls packed by maze_core.pack_walls
+MAGIC = b'MAZEBAT1'
+HEADER = struct.Struct('<IIH')
+SEED = struct.Struct('<q')
+
+
+# Generates one maze headless and returns its record, run in the worker processes
+def generate_record(job):
+    algorithm, rows, cols, seed = job
+    maze = MazeGenerator(rows, cols, 1, algorithm, headless=True, seed=seed).generate()
+    return SEED.pack(seed) + pack_walls(maze).tobytes()
+
+
+def write_header(file, algorithm, rows, cols):
+    name = algorithm.encode('utf-8')
+    file.write(MAGIC)
+    file.write(HEADER.pack(rows, cols, len(name)))
+    file.write(name)
+
+
+# Yields (seed, Maze) for every maze in a batch file
+def read_batch(path):
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a maze batch file")
+        rows, cols, name_length = HEADER.unpack(file.read(HEADER.size))
+        file.read(name_length)
+
+        record_size = SEED.size + packed_size(rows, cols)
+        while True:
+            record = file.read(record_size)
+            if len(record) < record_size:
+                return
+            seed = SEED.unpack_from(record)[0]
+            yield seed, unpack_walls(memoryview(record)[SEED.size:], rows, cols)
+
+
+# Generates 'count' mazes with seeds first_seed, first_seed+1, ... across a pool of processes, streaming each
+# record to the output file in seed order. Returns a report of the throughput.
+def generate_batch(path, algorithm, rows, cols, count, first_seed=0, processes=None, chunksize=64):
+    processes = process_count(processes)
+    jobs = ((algorithm, rows, cols, seed) for seed in range(first_seed, first_seed + count))
+
+    start = time.perf_counter()
+    written = 0
+    with open(path, 'wb') as file:
+        write_header(file, algorithm, rows, cols)
+        for record in map_jobs(generate_record, jobs, processes, chunksize):
+            file.write(record)
+            written += 1
+        size = file.tell()
+    seconds = time.perf_counter() - start
+
+    return {
+        'algorithm': algorithm,
+        'rows': rows,
+        'cols': cols,
+        'mazes': written,
+        'processes': processes,
+        'seconds': seconds,
+        'mazes_per_second': written / seconds if seconds else float('inf'),
+        'cells_per_second': written * rows * cols / seconds if seconds else float('inf'),
+        'bytes': size,
+    }
+
+
+def print_report(report):
+    print(f"{report['mazes']} {report['rows']}x{report['cols']} {report['algorithm']} mazes "
+          f"on {report['processes']} processes in {report['seconds']:.2f}s")
+    print(f"{report['mazes_per_second']:.0f} mazes/s, {report['cells_per_second']:.0f} cells/s, "
+          f"{report['bytes'] / 1e6:.1f} MB written")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a batch of mazes headless across a process pool")
+    parser.add_argument('output', help="batch file to write")
+    parser.add_argument('--algorithm', default="Depth First")
+    parser.add_argument('--rows', type=positive_int, default=64)
+    parser.add_argument('--cols', type=positive_int, default=64)
+    parser.add_argument('--count', type=positive_int, default=1000)
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first maze, each maze gets the next one")
+    parser.add_argument('--processes', type=positive_int, default=None, help="defaults to the number of CPUs")
+    args = parser.parse_args(argv)
+
+    report = generate_batch(args.output, args.algorithm, args.rows, args.cols, args.count, args.seed, args.processes)
+    print_report(report)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
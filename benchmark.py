@@ -0,0 +1,157 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from maze_generator import MazeGenerator, GENERATOR_VERSION
+from options import ALGORITHMS, positive_int
+
+SIZES = (20, 50, 100, 200, 500, 1000, 2000)
+# Throughput targets for headless runs, as the side length of a square maze and the most seconds it may take
+TARGETS = {
+    "Wilson's": (1000, 5.0),
+}
+
+
+# Makes a generator for the benchmark. Headless runs use the engines, visual runs go through the Cell based
+# algorithms and the renderer on SDL's dummy video driver, with no pacing or pauses.
+def make_generator(algorithm, size, mode, seed):
+    if mode == 'headless':
+        return MazeGenerator(size, size, 1, algorithm, headless=True, seed=seed)
+
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    return MazeGenerator(size, size, 1, algorithm, seed=seed, wait_time=0)
+
+
+# Times one algorithm at one size, the best of 'repeat' runs, then measures the peak memory of one more run with
+# tracemalloc. That's done separately as tracing slows the algorithms down as much as tenfold, and is skipped for
+# mazes of more than memory_cells cells, where peak_bytes is None.
+def measure(algorithm, size, mode, repeat, seed, memory_cells):
+    times = []
+    for i in range(repeat):
+        maze_gen = make_generator(algorithm, size, mode, seed + i)
+        gc.collect()
+        # Only the algorithm is timed, without the window being kept open at the end of a visual run
+        start = time.perf_counter()
+        maze_gen.algorithm.run()
+        times.append(time.perf_counter() - start)
+        del maze_gen
+
+    peak = None
+    if size * size <= memory_cells:
+        maze_gen = make_generator(algorithm, size, mode, seed)
+        gc.collect()
+        tracemalloc.start()
+        maze_gen.algorithm.run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    seconds = min(times)
+    cells = size * size
+    return {
+        'algorithm': algorithm,
+        'mode': mode,
+        'rows': size,
+        'cols': size,
+        'cells': cells,
+        'seconds': seconds,
+        'mean_seconds': sum(times) / len(times),
+        'cells_per_second': cells / seconds if seconds else float('inf'),
+        'peak_bytes': peak,
+    }
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'generator_version': GENERATOR_VERSION,
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+# Results which are slower than the baseline by more than 'threshold' times, matched on algorithm, mode and size
+def regressions(results, baseline, threshold):
+    previous = {(r['algorithm'], r['mode'], r['rows'], r['cols']): r for r in baseline['results']}
+    slower = []
+    for result in results:
+        before = previous.get((result['algorithm'], result['mode'], result['rows'], result['cols']))
+        if before is not None and result['seconds'] > before['seconds'] * threshold:
+            slower.append((result, before))
+    return slower
+
+
+# Headless results which took longer than their algorithm's target
+def missed_targets(results):
+    missed = []
+    for result in results:
+        target = TARGETS.get(result['algorithm'])
+        if target is None or result['mode'] != 'headless':
+            continue
+        size, seconds = target
+        if result['rows'] == size and result['cols'] == size and result['seconds'] > seconds:
+            missed.append((result, seconds))
+    return missed
+
+
+def print_result(result):
+    memory = "" if result['peak_bytes'] is None else f"{result['peak_bytes'] / 2**20:>9.2f} MB peak"
+    print(f"{result['algorithm']:<20} {result['rows']:>5}x{result['cols']:<5} {result['seconds']:>9.4f}s "
+          f"{result['cells_per_second']:>13,.0f} cells/s {memory}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the maze generating algorithms across maze sizes")
+    parser.add_argument('--output', default='benchmark.json', help="JSON file to write the results to")
+    parser.add_argument('--algorithms', nargs='+', default=ALGORITHMS, choices=ALGORITHMS, metavar='ALGORITHM')
+    parser.add_argument('--sizes', nargs='+', type=positive_int, default=SIZES, help="side lengths of the square mazes")
+    parser.add_argument('--mode', choices=('headless', 'visual'), default='headless',
+                        help="headless uses the engines, visual the Cell based algorithms on a dummy display")
+    parser.add_argument('--repeat', type=positive_int, default=3, help="runs per measurement, the fastest is kept")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--memory-cells', type=int, default=10**6,
+                        help="largest maze, in cells, whose peak memory is traced")
+    parser.add_argument('--baseline', default=None, help="earlier results to check for regressions against")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="how many times slower than the baseline counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = []
+    for algorithm in args.algorithms:
+        for size in args.sizes:
+            result = measure(algorithm, size, args.mode, args.repeat, args.seed, args.memory_cells)
+            print_result(result)
+            results.append(result)
+
+    with open(args.output, 'w') as file:
+        json.dump({'environment': environment(), 'results': results}, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    missed = missed_targets(results)
+    for result, seconds in missed:
+        print(f"Missed target: {result['algorithm']} {result['rows']}x{result['cols']} took {result['seconds']:.4f}s, "
+              f"the target is {seconds:.4f}s")
+
+    slower = []
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        slower = regressions(results, baseline, args.threshold)
+        for result, before in slower:
+            print(f"Regression: {result['algorithm']} {result['rows']}x{result['cols']} took {result['seconds']:.4f}s, "
+                  f"{before['seconds']:.4f}s before")
+    if missed or slower:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,76 @@
+import argparse
+import sys
+
+from options import ALGORITHMS, SOLVERS, positive_int
+
+# Command line entry point, 'python -m cli ROWS COLS'. Nothing beyond the standard library is imported until the
+# arguments have been parsed, NumPy is only imported to generate a maze, pygame only when it's to be shown in a
+# window and tkinter only for the set up window, which opens when no size is given.
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m cli', description="Generate a maze, headless unless --display "
+                                     "is given. Without a size the set up window is opened instead.")
+    parser.add_argument('rows', type=positive_int, nargs='?')
+    parser.add_argument('cols', type=positive_int, nargs='?')
+    parser.add_argument('--cell-size', type=positive_int, default=20, help="pixels per cell in the window")
+    parser.add_argument('--algorithm', default=ALGORITHMS[0], choices=ALGORITHMS, metavar='ALGORITHM',
+                        help=f"one of {', '.join(ALGORITHMS)}")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--output', default=None, help="maze file to save the maze and its solution to")
+    parser.add_argument('--display', action='store_true', help="animate the generation in a pygame window")
+    parser.add_argument('--duration', type=float, default=10, help="seconds the animation in the window aims to take")
+    parser.add_argument('--wait-time', type=float, default=None,
+                        help="seconds to pause after each step in the window instead of pacing it to --duration")
+    parser.add_argument('--solver', default=None, choices=SOLVERS,
+                        help="solve the maze and report on it, and animate the search in the window")
+    args = parser.parse_args(argv)
+    if (args.rows is None) != (args.cols is None):
+        parser.error("give both rows and cols, or neither for the set up window")
+    return args
+
+
+# Opens the tkinter set up window and generates the maze it's launched with, the same as main.py
+def launch():
+    from start_window import Window
+
+    win = Window()
+    win.run()
+    if win.launch_maze:
+        from maze_generator import MazeGenerator
+        MazeGenerator(win.maze_rows, win.maze_cols, win.maze_cell_size, win.chosen_algorithm).generate()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.rows is None:
+        launch()
+        return 0
+
+    from maze_generator import MazeGenerator
+
+    maze_gen = MazeGenerator(args.rows, args.cols, args.cell_size, args.algorithm, headless=not args.display,
+                             seed=args.seed, solver=args.solver, duration=args.duration, wait_time=args.wait_time)
+    maze = maze_gen.generate()
+    # The run's own time, without the time the window was left open afterwards
+    seconds = maze_gen.stats_record['total_time']
+    print(f"{args.rows}x{args.cols} {args.algorithm} maze in {seconds:.3f}s")
+
+    if args.solver is not None:
+        from solver import solve
+
+        result = solve(maze, args.solver)
+        print(f"{args.solver} solved it in {result['length']} moves, expanding {result['nodes_expanded']} cells in "
+              f"{result['seconds']:.3f}s")
+
+    if args.output is not None:
+        from maze_file import save_maze
+        from solver import Solver
+
+        save_maze(args.output, maze, Solver(maze, 0).path(maze.size - 1))
+        print(f"Saved to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,616 @@
+import heapq
+from array import array
+
+import numpy as np
+
+from disjoint_set import DisjointSet
+from event_log import CARVE
+from frontier import Frontier
+from maze_core import UP, DOWN, LEFT, RIGHT, OPPOSITE, index_dtype, index_typecode
+from maze_random import MazeRandom
+
+# Headless versions of the maze creating algorithms. They work on the integer cell indices of a Maze
+# (index = row * cols + col) and carve straight into its wall buffer, with no Cell objects or drawing.
+# 'rng' is a MazeRandom, which makes the result reproducible from its seed. Passing an EventLog as 'log' records
+# every step so the generation can be animated afterwards, and passing a RunStats as 'stats' adds the counts of the
+# run to it.
+
+
+# Recursive backtracker, the stack is a list of cell indices so pushing and popping are amortised O(1)
+def depth_first(maze, start=0, rng=None, log=None, stats=None):
+    if rng is None:
+        rng = MazeRandom()
+    rand = rng.random
+    cols = maze.cols
+    size = maze.size
+    last_col = cols - 1
+    walls = maze.buffer
+
+    # One byte per cell instead of a flag on every Cell
+    visited = bytearray(size)
+    visited[start] = 1
+    stack = [start]
+    push = stack.append
+    pop = stack.pop
+
+    current = start
+    backtracks = 0
+    while True:
+        col = current % cols
+        options = []
+        neighbour = current - cols
+        if neighbour >= 0 and not visited[neighbour]:
+            options.append((neighbour, UP, DOWN))
+        neighbour = current + cols
+        if neighbour < size and not visited[neighbour]:
+            options.append((neighbour, DOWN, UP))
+        if col > 0 and not visited[current - 1]:
+            options.append((current - 1, LEFT, RIGHT))
+        if col < last_col and not visited[current + 1]:
+            options.append((current + 1, RIGHT, LEFT))
+
+        # Walks to a random unvisited neighbour, otherwise backtracks
+        if options:
+            neighbour, side, opposite = options[int(rand() * len(options))]
+            walls[current] |= side
+            walls[neighbour] |= opposite
+            if log is not None:
+                log.carve(current, side)
+            visited[neighbour] = 1
+            push(neighbour)
+            current = neighbour
+        else:
+            pop()
+            backtracks += 1
+            if not stack:
+                break
+            current = stack[-1]
+            if log is not None:
+                log.backtrack(current)
+
+    if stats is not None:
+        stats.cells_visited += size
+        stats.backtracks += backtracks
+    return maze
+
+
+# Random walks until stuck, then hunts left to right, top to bottom for the first visited cell with an unvisited
+# neighbour and walks from there. A count of unvisited cells per row lets the hunt jump over whole rows which,
+# along with the rows either side, have nothing left to visit.
+def hunt_and_kill(maze, start=0, rng=None, log=None, stats=None):
+    if rng is None:
+        rng = MazeRandom()
+    rand = rng.random
+    rows = maze.rows
+    cols = maze.cols
+    size = maze.size
+    last_col = cols - 1
+    walls = maze.buffer
+
+    visited = bytearray(size)
+    row_unvisited = [cols] * rows
+    visited[start] = 1
+    row_unvisited[start // cols] -= 1
+
+    current = start
+    hunt = 0
+    # Positions the hunt has checked and moved past, not counting rows skipped whole
+    hunt_steps = 0
+    while True:
+        col = current % cols
+        options = []
+        neighbour = current - cols
+        if neighbour >= 0 and not visited[neighbour]:
+            options.append((neighbour, UP, DOWN))
+        neighbour = current + cols
+        if neighbour < size and not visited[neighbour]:
+            options.append((neighbour, DOWN, UP))
+        if col > 0 and not visited[current - 1]:
+            options.append((current - 1, LEFT, RIGHT))
+        if col < last_col and not visited[current + 1]:
+            options.append((current + 1, RIGHT, LEFT))
+
+        if options:
+            neighbour, side, opposite = options[int(rand() * len(options))]
+            walls[current] |= side
+            walls[neighbour] |= opposite
+            if log is not None:
+                log.carve(current, side)
+            visited[neighbour] = 1
+            row_unvisited[neighbour // cols] -= 1
+            current = neighbour
+            continue
+
+        # Hunt phase, everything before the hunt position has already been exhausted so it never moves backwards
+        hunt_start = hunt
+        while hunt < size:
+            row, col = divmod(hunt, cols)
+            if not (row_unvisited[row] or (row > 0 and row_unvisited[row - 1]) or (row < rows - 1 and row_unvisited[row + 1])):
+                hunt_start += (row + 1) * cols - hunt
+                hunt = (row + 1) * cols
+                continue
+            if visited[hunt] and ((row > 0 and not visited[hunt - cols]) or (row < rows - 1 and not visited[hunt + cols])
+                                  or (col > 0 and not visited[hunt - 1]) or (col < last_col and not visited[hunt + 1])):
+                break
+            hunt += 1
+        hunt_steps += hunt - hunt_start
+        if hunt == size:
+            break
+        current = hunt
+        if log is not None:
+            log.flash(current)
+
+    if stats is not None:
+        stats.cells_visited += size
+        stats.hunt_steps += hunt_steps
+    return maze
+
+
+# Picks a random cell next to the maze so far and joins it to a random visited neighbour. The frontier gives O(1)
+# membership tests, adds and random removals, so every step costs the same however large the frontier grows.
+def primms(maze, start=0, rng=None, log=None, stats=None):
+    if rng is None:
+        rng = MazeRandom()
+    rand = rng.random
+    cols = maze.cols
+    size = maze.size
+    last_col = cols - 1
+    walls = maze.buffer
+
+    visited = bytearray(size)
+    visited[start] = 1
+    frontier = Frontier(size)
+    # New frontier cells are marked in the log
+    if log is None:
+        add = frontier.add
+    else:
+        def add(cell):
+            if cell not in frontier:
+                frontier.add(cell)
+                log.mark(cell)
+    for neighbour in maze.neighbours(start):
+        add(neighbour)
+
+    while frontier:
+        current = frontier.pop_random(rand)
+        visited[current] = 1
+        col = current % cols
+
+        # Neighbours already in the maze are joining options, the others go into the frontier
+        options = []
+        neighbour = current - cols
+        if neighbour >= 0:
+            if visited[neighbour]:
+                options.append((neighbour, UP, DOWN))
+            else:
+                add(neighbour)
+        neighbour = current + cols
+        if neighbour < size:
+            if visited[neighbour]:
+                options.append((neighbour, DOWN, UP))
+            else:
+                add(neighbour)
+        if col > 0:
+            if visited[current - 1]:
+                options.append((current - 1, LEFT, RIGHT))
+            else:
+                add(current - 1)
+        if col < last_col:
+            if visited[current + 1]:
+                options.append((current + 1, RIGHT, LEFT))
+            else:
+                add(current + 1)
+
+        neighbour, side, opposite = options[int(rand() * len(options))]
+        walls[current] |= side
+        walls[neighbour] |= opposite
+        if log is not None:
+            log.carve(current, side)
+
+    if stats is not None:
+        stats.cells_visited += size
+    return maze
+
+
+# True randomised Prim's, every edge gets a random weight when it reaches the edge of the maze and the lightest
+# edge leading to an unvisited cell is always the next one carved
+def weighted_primms(maze, start=0, rng=None, log=None, stats=None):
+    if rng is None:
+        rng = MazeRandom()
+    rand = rng.random
+    cols = maze.cols
+    size = maze.size
+    last_col = cols - 1
+    walls = maze.buffer
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+
+    # Each edge is packed into one int, a 30 bit random weight above the outside cell's index and the side of that
+    # cell to open, so the heap only ever compares plain ints
+    shift = (size * 4).bit_length()
+    mask = (1 << shift) - 1
+    scale = 1 << 30
+    up_edge, down_edge, left_edge, right_edge = 0, 1, 2, 3
+    sides = (UP, DOWN, LEFT, RIGHT)
+    inside_offsets = (-cols, cols, -1, 1)
+
+    visited = bytearray(size)
+    edges = []
+    current = start
+    remaining = size - 1
+    while True:
+        visited[current] = 1
+        col = current % cols
+        if log is not None:
+            for neighbour in maze.neighbours(current):
+                if not visited[neighbour]:
+                    log.mark(neighbour)
+        neighbour = current - cols
+        if neighbour >= 0 and not visited[neighbour]:
+            heappush(edges, (int(rand() * scale) << shift) | (neighbour << 2 | down_edge))
+        neighbour = current + cols
+        if neighbour < size and not visited[neighbour]:
+            heappush(edges, (int(rand() * scale) << shift) | (neighbour << 2 | up_edge))
+        if col > 0 and not visited[current - 1]:
+            heappush(edges, (int(rand() * scale) << shift) | ((current - 1) << 2 | right_edge))
+        if col < last_col and not visited[current + 1]:
+            heappush(edges, (int(rand() * scale) << shift) | ((current + 1) << 2 | left_edge))
+
+        if not remaining:
+            break
+        # Edges whose outside cell has since been joined are stale and skipped
+        while True:
+            edge = heappop(edges) & mask
+            current = edge >> 2
+            if not visited[current]:
+                break
+        side = edge & 3
+        walls[current] |= sides[side]
+        walls[current + inside_offsets[side]] |= OPPOSITE[sides[side]]
+        if log is not None:
+            log.carve(current, sides[side])
+        remaining -= 1
+
+    if stats is not None:
+        stats.cells_visited += size
+    return maze
+
+
+# Every wall between two cells as an edge, cell * 2 for the cell's RIGHT side and cell * 2 + 1 for its DOWN side,
+# shuffled once into a random order
+def shuffled_edges(maze, rng):
+    index = np.arange(maze.size, dtype=np.int64).reshape(maze.rows, maze.cols)
+    edges = np.concatenate((index[:, :-1].ravel() * 2, index[:-1].ravel() * 2 + 1))
+    rng.generator.shuffle(edges)
+    return edges.tolist()
+
+
+# Randomised Kruskal's, the shuffled edges are carved in order whenever they join two cells which aren't connected
+# yet, with the connected pieces tracked by a DisjointSet
+def kruskals(maze, rng=None, log=None, stats=None):
+    if rng is None:
+        rng = MazeRandom()
+    cols = maze.cols
+    size = maze.size
+    walls = maze.buffer
+    union = DisjointSet(size).union
+
+    remaining = size - 1
+    for edge in shuffled_edges(maze, rng):
+        if not remaining:
+            break
+        cell = edge >> 1
+        if edge & 1:
+            other = cell + cols
+            side = DOWN
+        else:
+            other = cell + 1
+            side = RIGHT
+        if union(cell, other):
+            walls[cell] |= side
+            walls[other] |= OPPOSITE[side]
+            if log is not None:
+                log.carve(cell, side)
+            remaining -= 1
+
+    if stats is not None:
+        stats.cells_visited += size
+    return maze
+
+
+# Random sides for the walks of Wilson's algorithm, 0 to 3 for up, down, left and right, drawn in blocks
+def random_sides(rng, block=1 << 16):
+    generator = rng.generator
+    while True:
+        yield from generator.integers(0, 4, block, dtype=np.uint8).tolist()
+
+
+# Where a step from each cell to each side leads, at cell * 4 + side. A step off the edge of the maze stays in
+# the same cell, which only adds loops to the walks, so their loop-erased paths come out the same.
+def walk_moves(maze):
+    index = np.arange(maze.size, dtype=np.int64).reshape(maze.rows, maze.cols)
+    moves = np.repeat(index[:, :, None], 4, axis=2)
+    moves[1:, :, 0] = index[:-1]
+    moves[:-1, :, 1] = index[1:]
+    moves[:, 1:, 2] = index[:, :-1]
+    moves[:, :-1, 3] = index[:, 1:]
+    table = array(index_typecode(maze.size))
+    table.frombytes(moves.astype(index_dtype(maze.size)).tobytes())
+    return table
+
+
+# Wilson's algorithm, which gives every spanning tree of the grid the same chance so the mazes have none of the
+# other algorithms' biases. From each cell not yet in the maze it random walks until it reaches the maze, writing
+# the side it left each cell by into a 'next' array. Walking back into a cell overwrites that side, which erases
+# the loop, so following the array from the start cell afterwards traces the loop-erased walk, which is carved in.
+# The maze grows from 'start', by default the middle cell, as the first walks are much shorter from there than from
+# a corner. The tree is uniform whichever cell it grows from.
+def wilsons(maze, start=None, rng=None, log=None, stats=None):
+    if rng is None:
+        rng = MazeRandom()
+    if start is None:
+        start = maze.rows // 2 * maze.cols + maze.cols // 2
+    walls = maze.buffer
+    sides = (UP, DOWN, LEFT, RIGHT)
+    opposites = (DOWN, UP, RIGHT, LEFT)
+    moves = walk_moves(maze)
+    random_side = random_sides(rng)
+
+    in_maze = bytearray(maze.size)
+    in_maze[start] = 1
+    # Index into sides of the way the walk last left each cell
+    next_side = bytearray(maze.size)
+
+    for first in range(maze.size):
+        if in_maze[first]:
+            continue
+
+        cell = first
+        for side in random_side:
+            next_side[cell] = side
+            cell = moves[cell << 2 | side]
+            if in_maze[cell]:
+                break
+
+        cell = first
+        while not in_maze[cell]:
+            side = next_side[cell]
+            neighbour = moves[cell << 2 | side]
+            walls[cell] |= sides[side]
+            walls[neighbour] |= opposites[side]
+            if log is not None:
+                log.carve(cell, sides[side])
+            in_maze[cell] = 1
+            cell = neighbour
+
+    if stats is not None:
+        stats.cells_visited += maze.size
+    return maze
+
+
+# Eller's algorithm one row at a time. Only the set label of each cell in the current row is kept, so memory is
+# O(cols) however many rows are produced. Each call to next_row returns a finished row as a uint8 wall array and
+# finalize closes the maze off with a last row which joins every remaining set.
+class EllersStream:
+    def __init__(self, cols, rng=None, log=None):
+        if rng is None:
+            rng = MazeRandom()
+        self.cols = cols
+        self.rand = rng.random
+        self.log = log
+
+        # Set label of each cell in the current row, 0 for cells which haven't been given a set yet
+        self.labels = [0] * cols
+        self.next_label = 1
+        # UP bits of the current row, from the downwards connections of the row above
+        self.up = bytearray(cols)
+        self.rows_made = 0
+        self.finished = False
+        # Number of times two sets have been merged into one
+        self.merges = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.finished:
+            raise StopIteration
+        return self.next_row()
+
+    # Gives every cell without a set its own new set, and returns the cells of each set in the row
+    def fill_sets(self):
+        labels = self.labels
+        members = {}
+        for col in range(self.cols):
+            label = labels[col]
+            if not label:
+                label = self.next_label
+                self.next_label += 1
+                labels[col] = label
+            if label in members:
+                members[label].append(col)
+            else:
+                members[label] = [col]
+        return members
+
+    # Joins neighbouring cells of different sets, either at random or always, for the last row
+    def join_across(self, row, members, always):
+        labels = self.labels
+        rand = self.rand
+        for col in range(1, self.cols):
+            left = labels[col - 1]
+            right = labels[col]
+            if left != right and (always or rand() < 0.5):
+                row[col - 1] |= RIGHT
+                row[col] |= LEFT
+                if self.log is not None:
+                    self.log.carve(self.rows_made * self.cols + col, LEFT)
+                self.merges += 1
+                # Relabels the smaller set so each cell is relabelled O(log cols) times at most
+                if len(members[left]) < len(members[right]):
+                    left, right = right, left
+                for member in members[right]:
+                    labels[member] = left
+                members[left].extend(members.pop(right))
+
+    def next_row(self):
+        if self.finished:
+            raise ValueError("The maze has already been finalized")
+
+        row = bytearray(self.up)
+        members = self.fill_sets()
+        self.join_across(row, members, False)
+
+        # Each cell randomly carves down, and the last cell of a set carves down if none of the set has yet
+        labels = self.labels
+        rand = self.rand
+        remaining = {label: len(cols) for label, cols in members.items()}
+        extended = set()
+        below = [0] * self.cols
+        up = bytearray(self.cols)
+        for col in range(self.cols):
+            label = labels[col]
+            if rand() < 0.5 or (remaining[label] == 1 and label not in extended):
+                row[col] |= DOWN
+                up[col] = UP
+                if self.log is not None:
+                    self.log.carve(self.rows_made * self.cols + col, DOWN)
+                below[col] = label
+                extended.add(label)
+            remaining[label] -= 1
+
+        self.labels = below
+        self.up = up
+        self.rows_made += 1
+        return np.frombuffer(row, dtype=np.uint8)
+
+    # Makes the final row, which merges every set so the maze is closed off as a single perfect maze
+    def finalize(self):
+        if self.finished:
+            raise ValueError("The maze has already been finalized")
+
+        row = bytearray(self.up)
+        members = self.fill_sets()
+        self.join_across(row, members, True)
+
+        self.finished = True
+        self.rows_made += 1
+        return np.frombuffer(row, dtype=np.uint8)
+
+
+# Fills a whole maze from a stream of Eller's rows
+def ellers(maze, rng=None, log=None, stats=None):
+    stream = EllersStream(maze.cols, rng, log)
+    grid = maze.wall_grid
+    for row in range(maze.rows - 1):
+        grid[row] = stream.next_row()
+    grid[-1] = stream.finalize()
+    if stats is not None:
+        stats.cells_visited += maze.size
+        stats.set_merges += stream.merges
+    return maze
+
+
+# Streams an Eller's maze to a binary file object, one byte per cell, row by row, in O(cols) memory
+def write_ellers(file, rows, cols, rng=None):
+    stream = EllersStream(cols, rng)
+    for row in range(rows - 1):
+        file.write(stream.next_row().tobytes())
+    file.write(stream.finalize().tobytes())
+
+
+# Rows the vectorised algorithms draw their random arrays for at a time, which bounds the memory the arrays use.
+# The Cell based versions draw in the same blocks, so they use the random stream the same way.
+BLOCK_ROWS = 1024
+
+
+# Whether each cell of a block of rows carves up rather than left, from a single random bit, the first column
+# always carves up
+def binary_tree_block(generator, rows, cols):
+    up = generator.integers(0, 2, (rows, cols), dtype=np.uint8).astype(bool)
+    up[:, 0] = True
+    return up
+
+
+# Binary tree done with whole-array NumPy operations. The top row carves left all the way along, the first column
+# carves up, and every other cell carves up or left on a single random bit. Rows are done in blocks to bound the
+# memory used by the random arrays.
+def binary_tree(maze, rng=None, block_rows=BLOCK_ROWS, log=None, stats=None):
+    if rng is None:
+        rng = MazeRandom()
+    generator = rng.generator
+    walls = maze.wall_grid
+
+    walls[0, 1:] |= LEFT
+    walls[0, :-1] |= RIGHT
+    if log is not None:
+        top_row = np.arange(1, maze.cols)
+        log.extend(np.full(len(top_row), CARVE), top_row, np.full(len(top_row), LEFT))
+
+    for top in range(1, maze.rows, block_rows):
+        bottom = min(top + block_rows, maze.rows)
+        up = binary_tree_block(generator, bottom - top, maze.cols)
+
+        sides = np.where(up, np.uint8(UP), np.uint8(LEFT))
+        walls[top:bottom] |= sides
+        walls[top-1:bottom-1] |= up.astype(np.uint8) * np.uint8(DOWN)
+        walls[top:bottom, :-1] |= (~up[:, 1:]).astype(np.uint8) * np.uint8(RIGHT)
+        if log is not None:
+            log.extend(np.full(sides.size, CARVE), np.arange(top * maze.cols, bottom * maze.cols), sides.ravel())
+
+    if stats is not None:
+        stats.cells_visited += maze.size
+    return maze
+
+
+# Whether each cell of a block of rows carries its run on east, two thirds of the time and never for the last cell
+# of a row, along with where each run ends and the cell of it which carves up, as indices into the flattened block.
+# Rows never share a run as the last column ends one.
+def sidewinder_block(generator, rows, cols):
+    east = generator.integers(0, 3, (rows, cols), dtype=np.uint8) > 0
+    east[:, -1] = False
+    ends = np.flatnonzero(~east)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    chosen = starts + (generator.random(len(ends)) * (ends - starts + 1)).astype(ends.dtype)
+    return east, ends, chosen
+
+
+# Sidewinder done with whole-array NumPy operations. Each cell carries its run on east two thirds of the time, the
+# last cell of a row always ends its run, and each run carves up from one uniformly chosen member.
+def sidewinder(maze, rng=None, block_rows=BLOCK_ROWS, log=None, stats=None):
+    if rng is None:
+        rng = MazeRandom()
+    generator = rng.generator
+    walls = maze.wall_grid
+
+    walls[0, :-1] |= RIGHT
+    walls[0, 1:] |= LEFT
+    if log is not None:
+        top_row = np.arange(maze.cols - 1)
+        log.extend(np.full(len(top_row), CARVE), top_row, np.full(len(top_row), RIGHT))
+
+    for top in range(1, maze.rows, block_rows):
+        bottom = min(top + block_rows, maze.rows)
+        east, ends, chosen = sidewinder_block(generator, bottom - top, maze.cols)
+
+        carve = east[:, :-1].astype(np.uint8)
+        walls[top:bottom, :-1] |= carve * np.uint8(RIGHT)
+        walls[top:bottom, 1:] |= carve * np.uint8(LEFT)
+
+        walls[top:bottom].reshape(-1)[chosen] |= UP
+        walls[top-1:bottom-1].reshape(-1)[chosen] |= DOWN
+
+        # Each row's carves in cell order, the carve up of a run comes straight after the run ends
+        if log is not None:
+            right = np.flatnonzero(east)
+            cells = np.concatenate((right, chosen))
+            directions = np.concatenate((np.full(len(right), RIGHT), np.full(len(chosen), UP)))
+            keys = np.concatenate((right, ends))
+            order = np.argsort(keys, kind='stable')
+            log.extend(np.full(len(cells), CARVE), cells[order] + top * maze.cols, directions[order])
+
+    if stats is not None:
+        stats.cells_visited += maze.size
+    return maze
@@ -0,0 +1,72 @@
+from array import array
+
+import numpy as np
+
+# Operations which can be recorded while a maze is generated
+CARVE = 0  # opens the side 'direction' of the cell
+FLASH = 1  # briefly highlights the cell being considered
+BACKTRACK = 2  # highlights the cell a walk has backtracked to
+MARK = 3  # highlights the cell until it is carved into, e.g. the cells Primm's is considering
+
+# One packed record per event
+EVENT_DTYPE = np.dtype([('op', np.uint8), ('cell', np.int64), ('direction', np.uint8)])
+
+
+# Compact record of everything an algorithm did, so generation can run at full speed and be animated afterwards
+class EventLog:
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+
+        # Kept as three growable typed arrays while recording, appending to them is amortised O(1)
+        self.ops = bytearray()
+        self.cells = array('q')
+        self.directions = bytearray()
+
+    def __len__(self):
+        return len(self.ops)
+
+    def record(self, op, cell, direction=0):
+        self.ops.append(op)
+        self.cells.append(cell)
+        self.directions.append(direction)
+
+    def carve(self, cell, direction):
+        self.record(CARVE, cell, direction)
+
+    def flash(self, cell):
+        self.record(FLASH, cell)
+
+    def backtrack(self, cell):
+        self.record(BACKTRACK, cell)
+
+    def mark(self, cell):
+        self.record(MARK, cell)
+
+    # Records many events at once, used by the vectorised algorithms
+    def extend(self, ops, cells, directions):
+        self.ops.extend(np.asarray(ops, dtype=np.uint8).tobytes())
+        self.cells.frombytes(np.asarray(cells, dtype=np.int64).tobytes())
+        self.directions.extend(np.asarray(directions, dtype=np.uint8).tobytes())
+
+    # The log as a single structured array of (op, cell, direction) records
+    def to_array(self):
+        events = np.empty(len(self), dtype=EVENT_DTYPE)
+        events['op'] = np.frombuffer(self.ops, dtype=np.uint8)
+        events['cell'] = np.frombuffer(self.cells, dtype=np.int64)
+        events['direction'] = np.frombuffer(self.directions, dtype=np.uint8)
+        return events
+
+    @classmethod
+    def from_array(cls, rows, cols, events):
+        log = cls(rows, cols)
+        log.extend(events['op'], events['cell'], events['direction'])
+        return log
+
+    def save(self, path):
+        np.savez(path, rows=self.rows, cols=self.cols, events=self.to_array())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls.from_array(int(data['rows']), int(data['cols']), data['events'])
@@ -0,0 +1,38 @@
+from array import array
+
+from maze_core import index_typecode
+
+
+# Set of cell indices with O(1) add, membership and random removal. The cells are kept densely packed in a
+# list, a position index records where each cell sits in it, and a bitmap records which cells are in the set.
+class Frontier:
+    def __init__(self, size):
+        self.cells = []
+        self.position = array(index_typecode(size), [0]) * size
+        self.member = bytearray(size)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return self.member[cell] == 1
+
+    # Does nothing if the cell is already in the frontier
+    def add(self, cell):
+        if not self.member[cell]:
+            self.member[cell] = 1
+            self.position[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    # Removes and returns a random cell, rand is a function returning a float in [0, 1). The last cell is moved into
+    # its slot, so nothing has to be shifted along.
+    def pop_random(self, rand):
+        cells = self.cells
+        pos = int(rand() * len(cells))
+        cell = cells[pos]
+        last = cells.pop()
+        if last != cell:
+            cells[pos] = last
+            self.position[last] = pos
+        self.member[cell] = 0
+        return cell
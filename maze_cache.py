@@ -0,0 +1,186 @@
+import hashlib
+import os
+import struct
+import sys
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from maze_core import pack_walls, unpack_walls, packed_size, index_dtype
+
+# Each cached maze is one file named after the hash of its key, holding a header, the walls packed by
+# maze_core.pack_walls and the solution from the top left to the bottom right cell, stored as one 2 bit move per
+# step rather than a list of cell indices.
+#   header: b'MAZECAC1', rows (uint32), cols (uint32), number of moves in the solution (uint64)
+MAGIC = b'MAZECAC1'
+HEADER = struct.Struct('<8sIIQ')
+SUFFIX = '.maze'
+
+# Encodes a path of cell indices as a packed array of 2 bit moves, 0 up, 1 down, 2 left and 3 right
+def pack_path(path, cols):
+    steps = np.diff(np.asarray(path, dtype=np.int64))
+    codes = np.zeros(len(steps), dtype=np.uint8)
+    codes[steps == cols] = 1
+    codes[steps == -1] = 2
+    codes[steps == 1] = 3
+    bits = np.empty((len(steps), 2), dtype=bool)
+    bits[:, 0] = codes & 2
+    bits[:, 1] = codes & 1
+    return np.packbits(bits.reshape(-1))
+
+
+# Rebuilds the cell indices of a path from its start and packed moves
+def unpack_path(packed, moves, cols, start=0, dtype=np.int32):
+    bits = np.unpackbits(np.asarray(packed, dtype=np.uint8), count=moves * 2).reshape(moves, 2)
+    codes = bits[:, 0] * 2 + bits[:, 1]
+    offsets = np.array([-cols, cols, -1, 1], dtype=dtype)
+    path = np.empty(moves + 1, dtype=dtype)
+    path[0] = start
+    np.cumsum(offsets[codes], out=path[1:])
+    path[1:] += start
+    return path
+
+
+# Number of bytes pack_path uses for a path of the given number of moves
+def packed_path_size(moves):
+    return (moves * 2 + 7) // 8
+
+
+# Cache of generated mazes on disk, keyed by (algorithm, rows, cols, seed, generator version). The total size of
+# the files is capped at max_bytes, with the least recently used mazes removed first to make room.
+class MazeCache:
+    def __init__(self, directory, max_bytes=256 * 2**20, version=None):
+        if version is None:
+            from maze_generator import GENERATOR_VERSION
+            version = GENERATOR_VERSION
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version
+        os.makedirs(directory, exist_ok=True)
+
+        # File name to size, least recently used first. The order is rebuilt from the modification times, which
+        # are bumped on every hit.
+        self.entries = OrderedDict()
+        self.bytes = 0
+        files = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith(SUFFIX) and entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime_ns, entry.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self.entries[name] = size
+            self.bytes += size
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        # Total time spent in get(), hits and misses alike
+        self.lookup_seconds = 0.0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return self.file_name(*key) in self.entries
+
+    def file_name(self, algorithm, rows, cols, seed):
+        key = f"{algorithm}\0{rows}\0{cols}\0{seed}\0{self.version}".encode('utf-8')
+        return hashlib.sha256(key).hexdigest()[:32] + SUFFIX
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    # Returns the cached (Maze, solution) or None. Mazes without a seed are never cached, as they differ every time.
+    def get(self, algorithm, rows, cols, seed):
+        start = time.perf_counter()
+        result = None
+        if seed is not None:
+            name = self.file_name(algorithm, rows, cols, seed)
+            if name in self.entries:
+                result = self.read(name, rows, cols)
+
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.lookup_seconds += time.perf_counter() - start
+        return result
+
+    def read(self, name, rows, cols):
+        try:
+            with open(self.path(name), 'rb') as file:
+                data = file.read()
+            magic, file_rows, file_cols, moves = HEADER.unpack_from(data)
+            walls_end = HEADER.size + packed_size(rows, cols)
+            if magic != MAGIC or (file_rows, file_cols) != (rows, cols) or len(data) != walls_end + packed_path_size(moves):
+                raise ValueError(f"{name} is not a cached {rows}x{cols} maze")
+        except (OSError, ValueError, struct.error):
+            # Removed or damaged behind our back, it's regenerated and stored again
+            self.discard(name)
+            return None
+
+        maze = unpack_walls(memoryview(data)[HEADER.size:walls_end], rows, cols)
+        solution = unpack_path(memoryview(data)[walls_end:], moves, cols, dtype=index_dtype(maze.size))
+
+        self.entries.move_to_end(name)
+        os.utime(self.path(name))
+        return maze, solution
+
+    # Stores a generated maze and its solution, then evicts the least recently used mazes until it fits
+    def put(self, algorithm, rows, cols, seed, maze, solution):
+        if seed is None:
+            return
+        name = self.file_name(algorithm, rows, cols, seed)
+        moves = len(solution) - 1
+        data = HEADER.pack(MAGIC, rows, cols, moves) + pack_walls(maze).tobytes() + pack_path(solution, cols).tobytes()
+        if len(data) > self.max_bytes:
+            return
+
+        # Written to a temporary file and renamed, so a reader never sees half a maze
+        temporary = self.path(name + f'.{os.getpid()}.tmp')
+        with open(temporary, 'wb') as file:
+            file.write(data)
+        os.replace(temporary, self.path(name))
+
+        self.bytes -= self.entries.pop(name, 0)
+        self.entries[name] = len(data)
+        self.bytes += len(data)
+        self.stores += 1
+
+        while self.bytes > self.max_bytes:
+            self.discard(next(iter(self.entries)))
+            self.evictions += 1
+
+    def discard(self, name):
+        self.bytes -= self.entries.pop(name, 0)
+        try:
+            os.remove(self.path(name))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for name in list(self.entries):
+            self.discard(name)
+
+    # Hit/miss counts and sizes, for working out how big the cache needs to be
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'mean_lookup_seconds': self.lookup_seconds / lookups if lookups else 0.0,
+        }
+
+
+if __name__ == '__main__':
+    cache = MazeCache(sys.argv[1] if len(sys.argv) > 1 else 'maze_cache')
+    for key, value in cache.stats().items():
+        print(f"{key}: {value}")
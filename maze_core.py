@@ -0,0 +1,125 @@
+import numpy as np
+
+# Each cell of the maze is a single byte, with one bit set for every side of the cell which has been opened
+UP = 1
+DOWN = 2
+LEFT = 4
+RIGHT = 8
+
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+OPPOSITE = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+# Row and column offsets for moving through each side of a cell
+OFFSETS = {UP: (-1, 0), DOWN: (1, 0), LEFT: (0, -1), RIGHT: (0, 1)}
+
+
+# Smallest integer type which can hold every cell index of a maze
+def index_dtype(size):
+    if size < 2**31:
+        return np.int32
+    return np.int64
+
+
+# The array module's typecode for the same type as index_dtype
+def index_typecode(size):
+    if size < 2**31:
+        return 'i'
+    return 'q'
+
+
+# Headless store of the maze, the algorithms carve into this and renderers only read from it
+class Maze:
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+
+        # The bytearray is shared with the numpy array so plain python loops can write to it quickly
+        self.buffer = bytearray(self.size)
+        self.walls = np.frombuffer(self.buffer, dtype=np.uint8)
+
+    # The wall array as rows and columns, shares memory with self.walls
+    @property
+    def wall_grid(self):
+        return self.walls.reshape(self.rows, self.cols)
+
+    def index(self, row, col):
+        return row * self.cols + col
+
+    def position(self, index):
+        return divmod(index, self.cols)
+
+    # Indices of the cells adjacent to the given cell, worked out from its row and column
+    def neighbours(self, index):
+        row, col = divmod(index, self.cols)
+        neighbours = []
+        if row > 0:
+            neighbours.append(index - self.cols)
+        if row < self.rows - 1:
+            neighbours.append(index + self.cols)
+        if col > 0:
+            neighbours.append(index - 1)
+        if col < self.cols - 1:
+            neighbours.append(index + 1)
+        return neighbours
+
+    # Removes the wall on the given side of a cell and the matching wall of the cell next to it
+    def carve(self, row, col, direction):
+        d_row, d_col = OFFSETS[direction]
+        self.buffer[row * self.cols + col] |= direction
+        self.buffer[(row + d_row) * self.cols + col + d_col] |= OPPOSITE[direction]
+
+    # Carves the same side of many cells at once, cells is an array of cell indices
+    def carve_many(self, cells, direction):
+        d_row, d_col = OFFSETS[direction]
+        cells = np.asarray(cells)
+        np.bitwise_or.at(self.walls, cells, direction)
+        np.bitwise_or.at(self.walls, cells + (d_row * self.cols + d_col), OPPOSITE[direction])
+
+    # Finds which side of the first cell faces the second, adjacent, cell
+    @staticmethod
+    def direction_between(row, col, other_row, other_col):
+        if other_row > row:
+            return DOWN
+        if other_row < row:
+            return UP
+        if other_col > col:
+            return RIGHT
+        return LEFT
+
+    # Closes every wall again so the maze can be regenerated
+    def clear(self):
+        self.walls[:] = 0
+
+    def copy(self):
+        maze = Maze(self.rows, self.cols)
+        maze.walls[:] = self.walls
+        return maze
+
+
+# Packs a maze's walls into 2 bits per cell. Only the DOWN and RIGHT sides are stored, as every UP and LEFT side
+# is the DOWN or RIGHT side of the cell above or to the left.
+def pack_walls(maze):
+    grid = maze.wall_grid
+    bits = np.empty((maze.rows, maze.cols, 2), dtype=bool)
+    bits[:, :, 0] = grid & DOWN
+    bits[:, :, 1] = grid & RIGHT
+    return np.packbits(bits.reshape(-1))
+
+
+# Rebuilds a Maze from the output of pack_walls
+def unpack_walls(packed, rows, cols):
+    maze = Maze(rows, cols)
+    bits = np.unpackbits(np.asarray(packed, dtype=np.uint8), count=rows * cols * 2).reshape(rows, cols, 2)
+    down = bits[:, :, 0].astype(np.uint8)
+    right = bits[:, :, 1].astype(np.uint8)
+    grid = maze.wall_grid
+    grid |= down * np.uint8(DOWN)
+    grid |= right * np.uint8(RIGHT)
+    grid[1:] |= down[:-1] * np.uint8(UP)
+    grid[:, 1:] |= right[:, :-1] * np.uint8(LEFT)
+    return maze
+
+
+# Number of bytes pack_walls uses for a maze of the given size
+def packed_size(rows, cols):
+    return (rows * cols * 2 + 7) // 8
@@ -0,0 +1,328 @@
+import argparse
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+
+import numpy as np
+
+from maze_core import Maze, UP, DOWN, LEFT, RIGHT, index_dtype, index_typecode
+from maze_random import MazeRandom
+from options import positive_int
+
+# A maze file is a fixed header followed by page aligned sections, so each can be opened with numpy.memmap and
+# reading any part of the maze only touches the pages it covers.
+#   header (64 bytes, little endian): b'MAZEMAP1', format version (uint16), flags (uint16), rows (uint32),
+#       cols (uint32), then the offsets of the walls, parents and solution sections and the solution length (uint64
+#       each), with 0 offsets for the sections which aren't there
+#   walls: 2 bits per cell, DOWN then RIGHT, high bits first, each row padded out to a whole byte so any row
+#       starts at (cols + 3) // 4 * row bytes in. UP and LEFT are the DOWN and RIGHT of the cells above and left.
+#   parents (optional): one byte per cell, the side of the cell leading one step closer to the cell the maze was
+#       solved towards, 0 for cells not reached and ROOT for that cell itself
+#   solution (optional): cell indices from the start to the end, int32 below 2**31 cells, int64 above
+MAGIC = b'MAZEMAP1'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sHHIIQQQQ12x')
+ALIGN = 4096
+ROOT = 16
+
+
+def align(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+# A maze stored on disk and accessed through numpy.memmap, for mazes too big to hold in memory
+class MazeFile:
+    def __init__(self, path, mode='r'):
+        self.path = path
+        self.mode = mode
+        with open(path, 'rb') as file:
+            header = file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is not a maze file")
+        magic, version, _, self.rows, self.cols, self.walls_offset, self.parents_offset, self.solution_offset, \
+            self.solution_length = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a maze file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path} is maze file version {version}, only version {FORMAT_VERSION} can be read")
+
+        self.size = self.rows * self.cols
+        self.row_bytes = (self.cols + 3) // 4
+        self.index_dtype = index_dtype(self.size)
+        self.map_sections()
+
+    def map_sections(self):
+        self.bitmap = np.memmap(self.path, np.uint8, self.mode, self.walls_offset, (self.rows, self.row_bytes))
+        self.parents = None
+        self.solution = None
+        if self.parents_offset:
+            self.parents = np.memmap(self.path, np.uint8, self.mode, self.parents_offset, (self.rows, self.cols))
+        if self.solution_offset:
+            self.solution = np.memmap(self.path, self.index_dtype, self.mode, self.solution_offset,
+                                      (self.solution_length,))
+
+    # Makes a new maze file with every wall up. The sections are left as holes in the file, so only the pages
+    # which are written to take up any space.
+    @classmethod
+    def create(cls, path, rows, cols, parents=False):
+        walls_offset = align(HEADER.size)
+        end = walls_offset + rows * ((cols + 3) // 4)
+        parents_offset = 0
+        if parents:
+            parents_offset = align(end)
+            end = parents_offset + rows * cols
+
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, rows, cols, walls_offset, parents_offset, 0, 0))
+            file.truncate(max(end, HEADER.size))
+        return cls(path, 'r+')
+
+    def write_header(self):
+        with open(self.path, 'r+b') as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, self.rows, self.cols, self.walls_offset,
+                                   self.parents_offset, self.solution_offset, self.solution_length))
+
+    def flush(self):
+        for section in (self.bitmap, self.parents, self.solution):
+            if section is not None:
+                section.flush()
+
+    # Writes whole rows of a wall array, e.g. the rows of an EllersStream or a Maze's wall_grid, starting at 'top'
+    def write_rows(self, top, walls):
+        walls = np.asarray(walls, dtype=np.uint8).reshape(-1, self.cols)
+        bits = np.empty((len(walls), self.cols, 2), dtype=bool)
+        bits[:, :, 0] = walls & DOWN
+        bits[:, :, 1] = walls & RIGHT
+        self.bitmap[top:top + len(walls)] = np.packbits(bits.reshape(len(walls), -1), axis=1)
+
+    # A window of the maze as a Maze of its own. Only the rows of the window and the one above it are read, and
+    # only the bytes of those rows under the window. Like any Maze its edges are closed, so it can be solved on its
+    # own. With exits=True the sides of its edge cells which lead out of the window are returned along with it, as
+    # a wall array the shape of the window.
+    def read_region(self, top, left, rows, cols, exits=False):
+        bottom = min(top + rows, self.rows)
+        right = min(left + cols, self.cols)
+        # One more row and column above and to the left, whose DOWN and RIGHT sides are the window's UP and LEFT
+        first_row = max(top - 1, 0)
+        first_col = max(left - 1, 0)
+        first_byte = first_col // 4
+
+        band = np.asarray(self.bitmap[first_row:bottom, first_byte:(right - 1) // 4 + 1])
+        bits = np.unpackbits(band, axis=1).reshape(len(band), -1, 2)
+        bits = bits[:, first_col - first_byte * 4:right - first_byte * 4]
+        down = bits[:, :, 0]
+        across = bits[:, :, 1]
+
+        walls = down * np.uint8(DOWN) | across * np.uint8(RIGHT)
+        walls[1:] |= down[:-1] * np.uint8(UP)
+        walls[:, 1:] |= across[:, :-1] * np.uint8(LEFT)
+
+        window = walls[top - first_row:, left - first_col:]
+        maze = Maze(bottom - top, right - left)
+        grid = maze.wall_grid
+        grid[:] = window
+        if maze.size:
+            grid[0] &= np.uint8(DOWN | LEFT | RIGHT)
+            grid[-1] &= np.uint8(UP | LEFT | RIGHT)
+            grid[:, 0] &= np.uint8(UP | DOWN | RIGHT)
+            grid[:, -1] &= np.uint8(UP | DOWN | LEFT)
+        if exits:
+            return maze, window ^ grid
+        return maze
+
+    def to_maze(self):
+        return self.read_region(0, 0, self.rows, self.cols)
+
+    # Breadth first search from 'end' over the packed walls, filling in the parents section, then follows the parents
+    # from 'start' and stores the path as the solution section. Only the parents and the search queue are written
+    # to as it goes, and the queue only holds the cells at the edge of the search.
+    def solve(self, start=0, end=None):
+        if end is None:
+            end = self.size - 1
+        if self.parents is None:
+            self.add_parents()
+        else:
+            self.parents[:] = 0
+
+        cols = self.cols
+        row_bytes = self.row_bytes
+        walls = memoryview(self.bitmap).cast('B')
+        parents = memoryview(self.parents).cast('B')
+
+        # Open sides of a cell, read from its own 2 bits and those of the cells above and to the left
+        def sides(cell):
+            row, col = divmod(cell, cols)
+            offset = row * row_bytes
+            shift = 6 - 2 * (col & 3)
+            bits = walls[offset + (col >> 2)] >> shift
+            open_sides = (DOWN if bits & 2 else 0) | (RIGHT if bits & 1 else 0)
+            if row and walls[offset - row_bytes + (col >> 2)] >> shift & 2:
+                open_sides |= UP
+            if col and walls[offset + ((col - 1) >> 2)] >> (6 - 2 * ((col - 1) & 3)) & 1:
+                open_sides |= LEFT
+            return open_sides
+
+        parents[end] = ROOT
+        queue = deque([end])
+        pop = queue.popleft
+        append = queue.append
+        while queue:
+            cell = pop()
+            open_sides = sides(cell)
+            if open_sides & UP and not parents[cell - cols]:
+                parents[cell - cols] = DOWN
+                append(cell - cols)
+            if open_sides & DOWN and not parents[cell + cols]:
+                parents[cell + cols] = UP
+                append(cell + cols)
+            if open_sides & LEFT and not parents[cell - 1]:
+                parents[cell - 1] = RIGHT
+                append(cell - 1)
+            if open_sides & RIGHT and not parents[cell + 1]:
+                parents[cell + 1] = LEFT
+                append(cell + 1)
+        self.parents.flush()
+
+        if not parents[start]:
+            return None
+
+        steps = {UP: -cols, DOWN: cols, LEFT: -1, RIGHT: 1}
+        path = array(index_typecode(self.size), [start])
+        cell = start
+        while parents[cell] != ROOT:
+            cell += steps[parents[cell]]
+            path.append(cell)
+        self.write_solution(path)
+        return self.solution
+
+    # Adds an empty parents section to the end of the file
+    def add_parents(self):
+        self.parents_offset = align(os.path.getsize(self.path))
+        with open(self.path, 'r+b') as file:
+            file.truncate(self.parents_offset + self.size)
+        self.write_header()
+        self.map_sections()
+
+    # Stores a path of cell indices as the solution section, replacing any earlier one
+    def write_solution(self, path):
+        path = np.asarray(path, dtype=self.index_dtype)
+        if self.solution is None or len(path) > self.solution_length:
+            self.solution = None
+            self.solution_offset = align(os.path.getsize(self.path))
+        self.solution_length = len(path)
+        with open(self.path, 'r+b') as file:
+            file.seek(self.solution_offset)
+            file.write(path.tobytes())
+        self.write_header()
+        self.map_sections()
+
+
+# Saves an in-memory Maze, and optionally its solution, as a maze file
+def save_maze(path, maze, solution=None):
+    maze_file = MazeFile.create(path, maze.rows, maze.cols)
+    maze_file.write_rows(0, maze.wall_grid)
+    maze_file.flush()
+    if solution is not None:
+        maze_file.write_solution(solution)
+    return maze_file
+
+
+# Generates an Eller's maze straight into a maze file, holding only 'block_rows' rows in memory at a time
+def generate_ellers(path, rows, cols, seed=None, block_rows=256):
+    from engines import EllersStream
+
+    maze_file = MazeFile.create(path, rows, cols)
+    stream = EllersStream(cols, MazeRandom(seed))
+    block = np.empty((block_rows, cols), dtype=np.uint8)
+    for top in range(0, rows, block_rows):
+        count = min(block_rows, rows - top)
+        for i in range(count):
+            block[i] = stream.finalize() if top + i == rows - 1 else stream.next_row()
+        maze_file.write_rows(top, block[:count])
+    maze_file.flush()
+    return maze_file
+
+
+# Shows a window of a maze file, the arrow keys move it by half a window and Page Up/Page Down by a whole one
+def view(maze_file, view_rows=60, view_cols=80, cell_size=10):
+    import pygame
+    from maze_generator import MazeGenerator
+
+    view_rows = min(view_rows, maze_file.rows)
+    view_cols = min(view_cols, maze_file.cols)
+    renderer = MazeGenerator(view_rows, view_cols, cell_size, "Depth First").renderer
+    top = left = 0
+
+    # Passages leading out of the window are drawn open, into the border around it
+    def draw():
+        region, exits = maze_file.read_region(top, left, view_rows, view_cols, exits=True)
+        shown = region.copy()
+        shown.wall_grid[:] |= exits
+        renderer.draw_maze(shown)
+        if maze_file.solution is not None:
+            draw_solution(region)
+        renderer.set_caption(f"Maze file {maze_file.rows}x{maze_file.cols} at row {top}, column {left}")
+        renderer.flush()
+
+    # Draws the parts of the solution inside the window
+    def draw_solution(region):
+        path = np.asarray(maze_file.solution)
+        rows, cols = np.divmod(path, maze_file.cols)
+        inside = (rows >= top) & (rows < top + region.rows) & (cols >= left) & (cols < left + region.cols)
+        for i in np.flatnonzero(inside[:-1] & inside[1:]):
+            row, col = int(rows[i]) - top, int(cols[i]) - left
+            direction = region.direction_between(row, col, int(rows[i + 1]) - top, int(cols[i + 1]) - left)
+            renderer.path_line(renderer.cell_x(col), renderer.cell_y(row), direction, (255, 255, 0))
+
+    draw()
+    moves = {
+        pygame.K_UP: (-view_rows // 2, 0),
+        pygame.K_DOWN: (view_rows // 2, 0),
+        pygame.K_LEFT: (0, -view_cols // 2),
+        pygame.K_RIGHT: (0, view_cols // 2),
+        pygame.K_PAGEUP: (-view_rows, 0),
+        pygame.K_PAGEDOWN: (view_rows, 0),
+    }
+    while True:
+        renderer.clock.tick(30)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return
+            if event.type == pygame.KEYDOWN and event.key in moves:
+                row_step, col_step = moves[event.key]
+                top = min(max(top + row_step, 0), maze_file.rows - view_rows)
+                left = min(max(left + col_step, 0), maze_file.cols - view_cols)
+                draw()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate, solve and view memory mapped maze files")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help="stream an Eller's maze into a new maze file")
+    generate.add_argument('path')
+    generate.add_argument('rows', type=positive_int)
+    generate.add_argument('cols', type=positive_int)
+    generate.add_argument('--seed', type=int, default=None)
+
+    solve = commands.add_parser('solve', help="add the parents and solution sections to a maze file")
+    solve.add_argument('path')
+
+    show = commands.add_parser('view', help="scroll around a maze file in a window")
+    show.add_argument('path')
+    show.add_argument('--cell-size', type=positive_int, default=10)
+
+    args = parser.parse_args(argv)
+    if args.command == 'generate':
+        generate_ellers(args.path, args.rows, args.cols, args.seed)
+    elif args.command == 'solve':
+        solution = MazeFile(args.path, 'r+').solve()
+        print(f"Solution of {len(solution) - 1} moves" if solution is not None else "No solution")
+    else:
+        view(MazeFile(args.path), cell_size=args.cell_size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
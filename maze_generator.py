@@ -1,20 +1,53 @@
-import pygame
+import json
+
 import numpy as np
 #
 from algorithms import *
+from event_log import EventLog
+from maze_core import Maze, UP, DOWN, LEFT, RIGHT
+from maze_random import MazeRandom
+from solver import Solver
+from stats import RunStats
+
+# Bumped whenever a change to the algorithms changes the maze a seed gives, so cached mazes are regenerated
+GENERATOR_VERSION = 1
 
 
 class MazeGenerator:
-    def __init__(self, rows, cols, cell_size, algorithm):
+    def __init__(self, rows, cols, cell_size, algorithm, headless=False, record=False, seed=None, cache=None,
+                 hud=False, stats_file=None, solver=None, duration=10, wait_time=None):
         self.rows = rows
         self.cols = cols
         self.cell_size = cell_size
-
-        # Decides how long to pause based on the size of the maze, the larger the maze, the shorter the pause
-        if (self.rows + self.cols)//2 > 150:
-            self.wait_time = 0
-        else:
-            self.wait_time = 1 / (((self.rows+self.cols)//2) ** (1 + ((divmod((self.rows+self.cols)//2, 25)[0] + 1) / 20)))
+        # A headless maze is generated without opening a window or pausing
+        self.headless = headless
+        # A recorded maze is generated at full speed into an event log, which is then played back in the window
+        self.record = record
+        # The same algorithm, size and seed always give the same maze, None for a different maze every time
+        self.seed = seed
+        self.rng = MazeRandom(seed)
+        # MazeCache headless mazes are loaded from and stored in, only used when there's a seed
+        self.cache = cache
+        self.algorithm_name = algorithm
+        # Cell indices from the top left to the bottom right cell, filled in when a cache is used
+        self.solution = None
+
+        # Counters and timings of the run, shown over the maze when hud is set and kept in stats_record afterwards.
+        # Each record is also appended to stats_file as a line of JSON.
+        self.stats = RunStats()
+        self.hud = hud
+        self.stats_file = stats_file
+        self.stats_record = None
+        # Name of the solver in solver.SOLVERS whose search is animated before the path through the maze is drawn,
+        # None to just draw the path
+        self.solver = solver
+
+        # Seconds the animation of the maze being made aims to take, whatever its size. The pacer runs as many steps
+        # a frame as that takes, so the algorithms don't pause between steps themselves.
+        self.duration = duration
+        # Seconds to pause after each step instead, which leaves the pacer out and animates every maze at the same
+        # speed per step, 0 for no pauses at all. None paces the animation to duration.
+        self.wait_time = wait_time
 
         # Define colours
         self.WHITE = (255, 255, 255)
@@ -32,156 +65,242 @@ class MazeGenerator:
         self.wall_colour = self.DARK_GREY
         self.backtrack_colour = self.RED
         self.bg_colour = self.BLACK
+        self.search_colour = self.LIGHT_GREY
+
+        # Compact wall array which the algorithms carve into
+        self.maze = Maze(self.rows, self.cols)
+        self.log = EventLog(self.rows, self.cols) if self.record else None
 
-        # set up pygame window
+        # set up pygame window, pygame is only needed when the maze is drawn
         self.WINDOW_WIDTH = (self.cols+2)*self.cell_size
         self.WINDOW_HEIGHT = (self.rows+2)*self.cell_size
         self.FPS = 60
-        pygame.init()
-        self.clock = pygame.time.Clock()
-        self.WINDOW = pygame.display.set_mode((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
-        pygame.display.set_caption("Python Maze Generator")
+        if self.headless:
+            self.renderer = None
+            self.pacer = None
+        else:
+            from pacing import Pacer
+            from renderer import Renderer
+            self.renderer = Renderer(self)
+            self.pacer = Pacer(self, self.duration, self.FPS) if self.wait_time is None else None
         self.running = True
-        
-        # A map of all the cells in the maze
-        self.grid = self.make_grid()
-        self.add_cell_neighbours()
+
+        # A map of all the cells in the maze, only made once an algorithm needs Cell objects
+        self._grid = None
+        self.visited = None
 
         # A collection of the maze creating algorithms
         self.depth_first = DepthFirst(self)
         self.primms = Primms(self)
+        self.weighted_primms = Primms(self, weighted=True)
         self.binary_tree = BinaryTree(self)
         self.hunt_and_kill = HuntAndKill(self)
         self.sidewinder = Sidewinder(self)
         self.ellers = Ellers(self)
+        self.kruskals = Kruskals(self)
+        self.wilsons = Wilsons(self)
 
         # Dictionary to convert the output of the tkinter spinbox to an algorithm
         self.algorithms = {
             "Depth First" : self.depth_first,
             "Primm's" : self.primms,
+            "Primm's (Weighted)" : self.weighted_primms,
             "Binary Tree" : self.binary_tree,
             "Hunt and Kill" : self.hunt_and_kill,
             "Sidewinder" : self.sidewinder,
-            "Eller's" : self.ellers,            
+            "Eller's" : self.ellers,
+            "Kruskal's" : self.kruskals,
+            "Wilson's" : self.wilsons,
         }
         self.algorithm = self.algorithms[algorithm]
 
 
-    # clasee for each tile in the maze
+    # clasee for each tile in the maze. A cell only holds its position and the maze generator it's part of, which
+    # keeps everything the cells share once: the grid, the wall array, the renderer and a visited flag per cell.
     class Cell:
-        def __init__(self, row, col, cell_size, no_rows, no_cols, window, m_colour, bt_colour):
-            self.window = window
+        __slots__ = ('maze_gen', 'row', 'col', 'index')
 
+        def __init__(self, maze_gen, row, col):
+            self.maze_gen = maze_gen
             self.row = row
             self.col = col
+            self.index = row * maze_gen.cols + col
 
-            self.no_rows = no_rows
-            self.no_cols = no_cols
-            self.cell_size = cell_size
-            # converts the coordinates one cell width and height from the the top left corner
-            self.x = (self.col+1) * self.cell_size
-            self.y = (self.row+1) * self.cell_size
-            self.visited = False
-            self.neighbours = []
-            # used for Eller's Algorithm
-            self.set = None
-            
-            self.maze_colour = m_colour
-            self.backtrack_colour = bt_colour
+        @property
+        def visited(self):
+            return self.maze_gen.visited[self.index] == 1
 
-        def been_visited(self):
-            self.visited = True
+        @visited.setter
+        def visited(self, value):
+            self.maze_gen.visited[self.index] = 1 if value else 0
 
-        # Collects all adjacent cells 
-        def add_neighbours(self, grid):
-            self.neighbours = []
-            if self.row < self.no_rows-1:
-                self.neighbours.append(grid[self.row+1, self.col])
+        # converts the coordinates one cell width and height from the the top left corner
+        @property
+        def x(self):
+            return (self.col+1) * self.maze_gen.cell_size
 
+        @property
+        def y(self):
+            return (self.row+1) * self.maze_gen.cell_size
+
+        def been_visited(self):
+            self.maze_gen.visited[self.index] = 1
+
+        # Collects all adjacent cells, worked out from the row and column when asked for. They're in the same order as
+        # the engines' options, up, down, left, right, so a random pick from them takes the same neighbour.
+        @property
+        def neighbours(self):
+            maze_gen = self.maze_gen
+            grid = maze_gen.grid
+            neighbours = []
             if self.row > 0:
-                self.neighbours.append(grid[self.row-1, self.col])
+                neighbours.append(grid[self.row-1, self.col])
 
-            if self.col < self.no_cols-1:
-                self.neighbours.append(grid[self.row, self.col+1])
+            if self.row < maze_gen.rows-1:
+                neighbours.append(grid[self.row+1, self.col])
 
             if self.col > 0:
-                self.neighbours.append(grid[self.row, self.col-1])
+                neighbours.append(grid[self.row, self.col-1])
+
+            if self.col < maze_gen.cols-1:
+                neighbours.append(grid[self.row, self.col+1])
+            return neighbours
 
         def grab_unvisited_neighbours(self):
+            visited = self.maze_gen.visited
             unvisited_neighbours = []
             for neighbour in self.neighbours:
-                if not neighbour.visited:
+                if not visited[neighbour.index]:
                     unvisited_neighbours.append(neighbour)
             return unvisited_neighbours
 
         # Needed for Primm's
         def grab_visited_neighbours(self):
+            visited = self.maze_gen.visited
             visited_neighbours = []
             for neighbour in self.neighbours:
-                if neighbour.visited:
+                if visited[neighbour.index]:
                     visited_neighbours.append(neighbour)
             return visited_neighbours
 
         # Removes wall between current and adjacent cell
+        def open_side(self, direction):
+            self.maze_gen.maze.carve(self.row, self.col, direction)
+            if self.maze_gen.renderer is not None:
+                self.maze_gen.renderer.open_side(self.row, self.col, direction)
+
         def open_up(self):
-            pygame.draw.rect(self.window, self.maze_colour, (self.x+1, self.y+1-self.cell_size, self.cell_size-1, (2*self.cell_size)-1), 0)
+            self.open_side(UP)
 
         def open_down(self):
-            pygame.draw.rect(self.window, self.maze_colour, (self.x+1, self.y+1, self.cell_size-1, (2*self.cell_size)-1), 0)
+            self.open_side(DOWN)
 
         def open_left(self):
-            pygame.draw.rect(self.window, self.maze_colour, (self.x+1-self.cell_size, self.y+1, (2*self.cell_size)-1, self.cell_size-1), 0)
+            self.open_side(LEFT)
 
         def open_right(self):
-            pygame.draw.rect(self.window, self.maze_colour, (self.x+1, self.y+1, (2*self.cell_size)-1, self.cell_size-1), 0)
-
+            self.open_side(RIGHT)
 
         # Flashes the cell which is considered
         def show_cell(self):
-            pygame.draw.rect(self.window, self.backtrack_colour, (self.x+1, self.y+1, self.cell_size-1, self.cell_size-1), 0)         
+            if self.maze_gen.renderer is not None:
+                self.maze_gen.renderer.show_cell(self.row, self.col)
 
         def cover_cell(self):
-            pygame.draw.rect(self.window, self.maze_colour, (self.x+1, self.y+1, self.cell_size-1, self.cell_size-1), 0)   
-
-    # Draws all the walls for the maze
-    def draw_grid(self):
-        self.WINDOW.fill(self.bg_colour)
-        for i in range(self.rows+1):
-            pygame.draw.line(self.WINDOW, self.wall_colour, (self.cell_size, (i+1)*self.cell_size), (self.cell_size*(self.cols+1), (i+1)*self.cell_size))
-        for j in range(self.cols+1):
-            pygame.draw.line(self.WINDOW, self.wall_colour, ((j+1)*self.cell_size, self.cell_size), ((j+1)*self.cell_size, self.cell_size*(self.rows+1)))
-        pygame.display.update()
-
-    # Creates the map of all the cells
+            if self.maze_gen.renderer is not None:
+                self.maze_gen.renderer.cover_cell(self.row, self.col)
+
+        def clear_cell(self):
+            if self.maze_gen.renderer is not None:
+                self.maze_gen.renderer.clear_cell(self.row, self.col)
+
+    @property
+    def grid(self):
+        if self._grid is None:
+            self._grid = self.make_grid()
+        return self._grid
+
+    # Creates the map of all the cells, along with their visited flags, one byte per cell
     def make_grid(self):
-        grid = np.empty((0, self.cols))
-        for i in range(self.rows):
-            grid_row = np.empty((0,1))
-            for j in range(self.cols):
-                cell = self.Cell(i, j, self.cell_size, self.rows, self.cols, self.WINDOW, self.maze_colour, self.backtrack_colour)
-                grid_row = np.append(grid_row, cell)
-            grid = np.append(grid, np.array([grid_row]), axis=0)
-
-        return grid
-
-    def add_cell_neighbours(self):
-        for row in self.grid:
-            for cell in row:
-                cell.add_neighbours(self.grid)
-
-    # Starts the maze creations algorithm
+        self.visited = bytearray(self.rows * self.cols)
+        # Allocated once up front, filling it is linear in the number of cells
+        grid = np.empty(self.rows * self.cols, dtype=object)
+        # Every row shares the same column number objects, rather than each cell having ints of its own
+        col_numbers = list(range(self.cols))
+        grid[:] = [self.Cell(self, i, j) for i in range(self.rows) for j in col_numbers]
+
+        return grid.reshape(self.rows, self.cols)
+
+    # Starts the maze creations algorithm, returns the finished wall array
     def generate(self):
-        
-        self.draw_grid()
+        if self.headless:
+            self.stats.start()
+            if self.cache is not None and self.seed is not None:
+                self.generate_cached()
+            else:
+                self.algorithm.run()
+            self.finish_stats()
+            return self.maze
+
+        if self.record:
+            from player import Player
+            self.stats.start()
+            self.algorithm.run()
+            self.finish_stats()
+            Player(self, self.log, self.duration).play()
+            self.running = False
+            return self.maze
+
+        from renderer import WindowClosed
+        self.renderer.draw_grid()
+
+        self.stats.start()
+        try:
+            self.algorithm.run()
+        except WindowClosed:
+            # Closing the window part way through stops the run, leaving the maze as far as it got
+            self.finish_stats()
+            self.renderer.close()
+            self.running = False
+            return self.maze
+        # Anything still waiting to be drawn is part of the run
+        if self.hud:
+            self.renderer.draw_hud()
+        self.renderer.flush()
+        self.finish_stats()
+
+        self.renderer.wait_for_close(self.FPS)
+        self.running = False
+        return self.maze
+
+    # Stops the run's stats and keeps them as a record, along with what was run
+    def finish_stats(self):
+        self.stats.stop()
+        self.stats_record = {
+            'algorithm': self.algorithm_name,
+            'rows': self.rows,
+            'cols': self.cols,
+            'seed': self.seed,
+            'mode': 'headless' if self.headless else 'recorded' if self.record else 'visual',
+        }
+        self.stats_record.update(self.stats.as_dict())
+        if self.stats_file is not None:
+            with open(self.stats_file, 'a') as file:
+                file.write(json.dumps(self.stats_record) + '\n')
+        return self.stats_record
+
+    # Loads the maze from the cache, or generates it and stores it along with its solution
+    def generate_cached(self):
+        cached = self.cache.get(self.algorithm_name, self.rows, self.cols, self.seed)
+        if cached is not None:
+            maze, self.solution = cached
+            self.maze.buffer[:] = maze.buffer
+            return self.maze
 
         self.algorithm.run()
-
-        while self.running:
-            self.clock.tick(self.FPS)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    
+        self.solution = Solver(self.maze, 0).path(self.maze.size - 1)
+        self.cache.put(self.algorithm_name, self.rows, self.cols, self.seed, self.maze, self.solution)
+        return self.maze
 
 
 if __name__ == '__main__':
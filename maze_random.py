@@ -0,0 +1,35 @@
+import itertools
+
+import numpy as np
+
+
+# Per-maze source of random numbers. Floats are drawn from a seeded NumPy Generator in blocks and handed out one at
+# a time, so the same seed always gives the same maze and each draw is just the next item of a list. The block
+# size starts small, so small mazes don't pay for draws they never use, and doubles up to max_block.
+class MazeRandom:
+    def __init__(self, seed=None, first_block=256, max_block=65536):
+        self.seed = seed
+        # Used directly by the vectorised algorithms
+        self.generator = np.random.default_rng(seed)
+        self.first_block = first_block
+        self.max_block = max_block
+
+        # random() is the C level __next__ of a chain over the blocks, so it costs about as much as random.random()
+        self.random = itertools.chain.from_iterable(self.blocks()).__next__
+
+    def blocks(self):
+        size = self.first_block
+        while True:
+            yield self.generator.random(size).tolist()
+            size = min(size * 2, self.max_block)
+
+    # Random int in [0, n)
+    def randrange(self, n):
+        return int(self.random() * n)
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    # True with probability p
+    def chance(self, p):
+        return self.random() < p
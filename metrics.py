@@ -0,0 +1,167 @@
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from maze_core import UP, DOWN, LEFT, RIGHT, index_dtype
+from options import ALGORITHMS, positive_int
+from parallel import map_jobs
+from solver import OPEN_SIDES, bfs
+
+# Measures of what a maze is like, for choosing an algorithm for a use. Everything but the path lengths is counted
+# with whole-array operations on the wall arrays, which can be a single (rows, cols) maze or a (count, rows, cols)
+# stack of mazes of the same size, giving one value per maze. The path lengths take two breadth first searches.
+
+
+# Cells with a single open side
+def dead_ends(grid):
+    return np.count_nonzero(OPEN_SIDES[grid] == 1, axis=(-2, -1))
+
+
+# Cells with two open sides which aren't opposite each other, as a fraction of all the cells with two open sides
+def turn_ratio(grid):
+    corridors = OPEN_SIDES[grid] == 2
+    straight = (grid == UP | DOWN) | (grid == LEFT | RIGHT)
+    count = np.count_nonzero(corridors, axis=(-2, -1))
+    turns = np.count_nonzero(corridors & ~straight, axis=(-2, -1))
+    return turns / np.maximum(count, 1)
+
+
+# Length in cells of every straight corridor, the longest runs of passages all the same way, across and down
+def run_lengths(grid):
+    grid = grid.reshape((-1,) + grid.shape[-2:])
+    across = (grid[:, :, :-1] & RIGHT) > 0
+    down = (grid[:, :-1, :] & DOWN) > 0
+    return np.concatenate((true_runs(across), true_runs(np.swapaxes(down, 1, 2))))
+
+
+# Lengths of the runs of True along the last axis, plus one as a run of n passages joins n + 1 cells
+def true_runs(passages):
+    # A maze one cell wide or high has no passages one of the ways
+    if passages.size == 0:
+        return np.empty(0, dtype=np.intp)
+    rows = passages.reshape(-1, passages.shape[-1])
+    padded = np.zeros((rows.shape[0], rows.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = rows
+    # Runs start where a row goes from False to True and end where it goes back, with the padding closing them
+    edges = np.diff(padded.ravel())
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return ends - starts + 1
+
+
+# Moves along the path from the top left to the bottom right cell, and the most moves between any two cells. In a
+# perfect maze the cell furthest from any cell is one end of a longest path, so searching again from there finds
+# the diameter. The first search starts from the entry so it gives the solution length as well.
+def path_lengths(maze):
+    distance = np.frombuffer(bfs(maze, 0)[0], dtype=index_dtype(maze.size))
+    solution = int(distance[-1])
+    furthest = int(distance.argmax())
+    distance = np.frombuffer(bfs(maze, furthest)[0], dtype=distance.dtype)
+    return solution, int(distance.max())
+
+
+# All the metrics of a list of mazes of the same size, one dict per maze, along with the lengths of all their
+# straight corridors together
+def measure_mazes(mazes):
+    grid = np.stack([maze.wall_grid for maze in mazes])
+    cells = grid.shape[1] * grid.shape[2]
+    counts = dead_ends(grid)
+    turns = turn_ratio(grid)
+    results = []
+    for i, maze in enumerate(mazes):
+        solution, diameter = path_lengths(maze)
+        results.append({
+            'dead_ends': int(counts[i]),
+            'dead_end_ratio': float(counts[i] / cells),
+            'turn_ratio': float(turns[i]),
+            'solution_length': solution,
+            'diameter': diameter,
+        })
+    return results, run_lengths(grid)
+
+
+# Generates and measures the mazes for a chunk of seeds, run in the worker processes
+def measure_chunk(job):
+    from maze_generator import MazeGenerator
+
+    algorithm, rows, cols, seeds = job
+    mazes = [MazeGenerator(rows, cols, 1, algorithm, headless=True, seed=seed).generate() for seed in seeds]
+    results, runs = measure_mazes(mazes)
+    return results, np.bincount(runs)
+
+
+# Measures 'count' mazes of each algorithm, seeded first_seed, first_seed+1, ..., across a pool of processes, and
+# sums them up into one row per algorithm
+def sweep(algorithms, rows, cols, count, first_seed=0, processes=None, chunk=64):
+    summary = []
+    for algorithm in algorithms:
+        jobs = [(algorithm, rows, cols, range(start, min(start + chunk, first_seed + count)))
+                for start in range(first_seed, first_seed + count, chunk)]
+        begin = time.perf_counter()
+        chunks = list(map_jobs(measure_chunk, jobs, processes))
+        seconds = time.perf_counter() - begin
+
+        results = [result for results, _ in chunks for result in results]
+        histogram = np.zeros(max(len(runs) for _, runs in chunks), dtype=np.int64)
+        for _, runs in chunks:
+            histogram[:len(runs)] += runs
+        summary.append(summarise(algorithm, rows, cols, results, histogram, seconds))
+    return summary
+
+
+# Means over the mazes of one algorithm, and the spread of their corridor lengths from the histogram of them
+def summarise(algorithm, rows, cols, results, histogram, seconds):
+    row = {'algorithm': algorithm, 'rows': rows, 'cols': cols, 'mazes': len(results), 'seconds': seconds}
+    for key in ('dead_end_ratio', 'turn_ratio', 'solution_length', 'diameter'):
+        values = np.array([result[key] for result in results], dtype=np.float64)
+        row[key] = values.mean()
+        row[key + '_std'] = values.std()
+
+    # Corridor lengths, with the median and 90th percentile read off the running total of the histogram. A maze
+    # of a single cell has no corridors, which counts as all of them being 0 long.
+    total = np.cumsum(histogram)
+    if not len(total) or not total[-1]:
+        row.update({'run_mean': 0.0, 'run_median': 0, 'run_p90': 0, 'run_max': 0, 'run_histogram': histogram.tolist()})
+        return row
+    lengths = np.arange(len(histogram))
+    row['run_mean'] = (histogram * lengths).sum() / total[-1]
+    row['run_median'] = int(np.searchsorted(total, total[-1] * 0.5))
+    row['run_p90'] = int(np.searchsorted(total, total[-1] * 0.9))
+    row['run_max'] = int(lengths[histogram > 0].max())
+    row['run_histogram'] = histogram.tolist()
+    return row
+
+
+def print_table(summary):
+    print(f"{'algorithm':<20} {'mazes':>6} {'dead ends':>10} {'turns':>6} {'run mean':>9} {'median':>7} {'p90':>5} "
+          f"{'max':>5} {'solution':>9} {'diameter':>9}")
+    for row in summary:
+        print(f"{row['algorithm']:<20} {row['mazes']:>6} {row['dead_end_ratio']:>10.3f} {row['turn_ratio']:>6.3f} "
+              f"{row['run_mean']:>9.2f} {row['run_median']:>7} {row['run_p90']:>5} {row['run_max']:>5} "
+              f"{row['solution_length']:>9.1f} {row['diameter']:>9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the mazes each algorithm makes and sum them up in a table")
+    parser.add_argument('rows', type=positive_int)
+    parser.add_argument('cols', type=positive_int)
+    parser.add_argument('--algorithms', nargs='+', default=ALGORITHMS, choices=ALGORITHMS, metavar='ALGORITHM')
+    parser.add_argument('--count', type=positive_int, default=1000, help="mazes per algorithm")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first maze, the rest follow on from it")
+    parser.add_argument('--processes', type=positive_int, default=None, help="defaults to the number of CPUs")
+    parser.add_argument('--output', default=None, help="JSON file to write the summary to")
+    args = parser.parse_args(argv)
+
+    summary = sweep(args.algorithms, args.rows, args.cols, args.count, args.seed, args.processes)
+    print_table(summary)
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(summary, file, indent=2)
+        print(f"Summary written to {args.output}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,23 @@
+import argparse
+
+# Names and argument types shared by the command lines and the set up window. Only the standard library is imported
+# here, so parsing arguments doesn't import NumPy, pygame or the algorithms.
+
+# The names MazeGenerator.algorithms takes, in the order they're offered
+ALGORITHMS = ("Depth First", "Primm's", "Primm's (Weighted)", "Binary Tree", "Hunt and Kill", "Sidewinder",
+              "Eller's", "Kruskal's", "Wilson's")
+
+# The names solver.SOLVERS takes
+SOLVERS = ('bfs', 'astar', 'dead_end', 'wall_follower')
+
+
+# argparse type for sizes and counts, so a size below 1 gives a usage error rather than a traceback from deep in the
+# generator
+def positive_int(text):
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{text!r} is not a whole number")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"{text!r} must be at least 1")
+    return value
@@ -0,0 +1,98 @@
+import itertools
+import time
+
+import pygame
+
+from renderer import WindowClosed
+
+
+# Paces a Cell based algorithm in the window. Each frame runs however many steps keep the animation on course to
+# finish the maze in 'duration' seconds, then pushes everything drawn to the screen once, handles the window's
+# events and sleeps out what's left of the frame. How far through the maze the algorithm is comes from the cells
+# it has visited, and the steps it has taken for that so far give how many more it needs to catch up. Fractions of
+# a step are carried over to the next frame, so small mazes can take less than a step a frame.
+#   Space pauses, the right and up arrows double the speed and the left and down arrows halve it.
+class Pacer:
+    def __init__(self, maze_gen, duration, fps):
+        self.maze_gen = maze_gen
+        self.renderer = maze_gen.renderer
+        self.stats = maze_gen.stats
+        self.duration = duration
+        self.frame_time = 1 / fps
+
+        self.speed = 1.0
+        self.paused = False
+        # Steps run each frame, which can be a fraction of a step
+        self.rate = 1.0
+        self.backlog = 0.0
+        self.steps_taken = 0
+        # Seconds of animation played so far, which pass faster or slower with the speed and not while paused
+        self.played = 0.0
+        # How much faster each frame gets once every cell has been visited
+        self.tail_speed_up = 1.05
+
+    # Share of the maze's cells the algorithm has reached
+    def progress(self):
+        return min(self.stats.cells_visited / self.maze_gen.maze.size, 1.0)
+
+    # Runs a steps generator to the end, a frame at a time
+    def run(self, steps):
+        steps = iter(steps)
+        finished = False
+        while not finished:
+            start = time.perf_counter()
+            if not self.paused:
+                self.backlog += self.rate
+                count = int(self.backlog)
+                self.backlog -= count
+                ran = sum(1 for _ in itertools.islice(steps, count))
+                self.steps_taken += ran
+                finished = ran < count
+
+            self.renderer.flush()
+            self.handle_events()
+            self.end_frame(start)
+
+    def handle_events(self):
+        start = time.perf_counter()
+        closed = self.renderer.window_closed(self.handle_key)
+        self.stats.event_time += time.perf_counter() - start
+        if closed:
+            raise WindowClosed
+
+    def handle_key(self, key):
+        if key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif key in (pygame.K_RIGHT, pygame.K_UP):
+            self.speed *= 2
+        elif key in (pygame.K_LEFT, pygame.K_DOWN):
+            self.speed /= 2
+
+    # Sleeps out the rest of the frame, keeps its time and works out how many steps the next frame should run
+    def end_frame(self, start):
+        work = time.perf_counter() - start
+        if work < self.frame_time:
+            time.sleep(self.frame_time - work)
+            self.stats.sleep_time += time.perf_counter() - start - work
+        self.stats.add_frame(time.perf_counter() - start, work > self.frame_time)
+
+        if not self.paused:
+            self.played += (time.perf_counter() - start) * self.speed
+            self.adjust_rate()
+
+    # Aims to be as far through the maze at the end of the next frame as the time played says it should be, with
+    # the rate at most doubling each frame so one slow frame doesn't make the animation jump ahead. Once every cell
+    # has been visited, or the time is up, there's no telling how much is left, such as backtracking, stale edges or
+    # drawing the path through the maze. From then on it never slows down and speeds up by at least a twentieth
+    # each frame, so it can't drag on.
+    def adjust_rate(self):
+        if not self.steps_taken:
+            return
+        progress = self.progress()
+        target = (self.played + self.frame_time * self.speed) / self.duration
+        if progress >= 1 or target >= 1:
+            self.rate = max(self.rate * self.tail_speed_up, 1.0)
+            return
+        steps_per_progress = self.steps_taken / progress
+        wanted = (target - progress) * steps_per_progress
+        self.rate = min(max(wanted, 0.0), self.rate * 2 + 1)
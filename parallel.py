@@ -0,0 +1,18 @@
+import multiprocessing
+import os
+
+
+# Number of worker processes to use, one per CPU unless given
+def process_count(processes=None):
+    return processes or os.cpu_count()
+
+
+# Yields func(job) for each job in order, worked out across a pool of processes. With a single process the jobs are
+# run in this one, without starting a pool.
+def map_jobs(func, jobs, processes=None, chunksize=1):
+    processes = process_count(processes)
+    if processes == 1:
+        yield from map(func, jobs)
+        return
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap(func, jobs, chunksize)
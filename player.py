@@ -0,0 +1,112 @@
+import pygame
+import sys
+
+from event_log import EventLog, CARVE, FLASH, BACKTRACK, MARK
+from maze_core import Maze, DIRECTIONS
+
+
+# Replays an EventLog in a maze generator's window, independently of how fast the maze was generated.
+# Space pauses, the right and left arrows double and halve the speed, Home and End seek to the start and end,
+# and the number keys 0-9 seek to that tenth of the log.
+class Player:
+    def __init__(self, maze_gen, log, duration):
+        self.renderer = maze_gen.renderer
+        self.fps = maze_gen.FPS
+        self.log = log
+        self.events = log.to_array()
+
+        # Events played per second, at normal speed the whole log takes about 'duration' seconds
+        self.base_speed = max(len(self.events) / duration, 1)
+        self.speed = self.base_speed
+        self.paused = False
+        self.position = 0
+
+        # The maze as it stands at the current position
+        self.maze = Maze(log.rows, log.cols)
+        # Cell highlighted by the last flash or backtrack, restored by the next event
+        self.highlighted = None
+
+    # Covers a highlighted cell again, in the background colour if nothing has been carved into it yet
+    def restore(self, cell):
+        row, col = self.maze.position(cell)
+        if self.maze.buffer[cell]:
+            self.renderer.cover_cell(row, col)
+        else:
+            self.renderer.clear_cell(row, col)
+
+    def apply(self, event):
+        op, cell, direction = int(event['op']), int(event['cell']), int(event['direction'])
+        if self.highlighted is not None:
+            self.restore(self.highlighted)
+            self.highlighted = None
+
+        row, col = self.maze.position(cell)
+        if op == CARVE:
+            self.maze.carve(row, col, direction)
+            self.renderer.open_side(row, col, direction)
+        elif op == FLASH or op == BACKTRACK:
+            self.renderer.show_cell(row, col)
+            self.highlighted = cell
+        elif op == MARK:
+            self.renderer.show_cell(row, col)
+
+    # Jumps to any position by rebuilding the maze from the carves before it, then redrawing it whole
+    def seek(self, position):
+        self.position = max(0, min(position, len(self.events)))
+        self.highlighted = None
+
+        events = self.events[:self.position]
+        carves = events[events['op'] == CARVE]
+        self.maze.clear()
+        for direction in DIRECTIONS:
+            self.maze.carve_many(carves['cell'][carves['direction'] == direction], direction)
+        self.renderer.draw_maze(self.maze)
+
+    def handle_key(self, key):
+        if key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif key == pygame.K_RIGHT:
+            self.speed *= 2
+        elif key == pygame.K_LEFT:
+            self.speed = max(self.speed / 2, 1)
+        elif key == pygame.K_HOME:
+            self.seek(0)
+        elif key == pygame.K_END:
+            self.seek(len(self.events))
+        elif pygame.K_0 <= key <= pygame.K_9:
+            self.seek(len(self.events) * (key - pygame.K_0) // 10)
+
+    # Plays the log until the window is closed
+    def play(self):
+        self.renderer.draw_grid()
+        backlog = 0
+        running = True
+        while running:
+            frame_seconds = self.renderer.clock.tick(self.fps) / 1000
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    self.handle_key(event.key)
+
+            if not self.paused and self.position < len(self.events):
+                # Carries fractions of an event over to the next frame so slow speeds still progress
+                backlog += self.speed * frame_seconds
+                steps = int(backlog)
+                backlog -= steps
+                end = min(self.position + steps, len(self.events))
+                for event in self.events[self.position:end]:
+                    self.apply(event)
+                self.position = end
+
+            self.renderer.flush()
+
+
+# Plays a saved log, e.g. python player.py maze_log.npz 10
+if __name__ == '__main__':
+    from maze_generator import MazeGenerator
+
+    log = EventLog.load(sys.argv[1])
+    cell_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    mg = MazeGenerator(log.rows, log.cols, cell_size, "Depth First")
+    Player(mg, log, mg.duration).play()
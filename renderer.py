@@ -0,0 +1,196 @@
+import pygame
+import time
+import numpy as np
+
+from maze_core import UP, DOWN, LEFT, RIGHT
+
+
+# Raised when the window is closed part way through a run, so whatever is running the algorithm can stop it
+class WindowClosed(Exception):
+    pass
+
+
+# Draws a maze generator's wall array into a pygame window
+class Renderer:
+    def __init__(self, maze_gen):
+        self.rows = maze_gen.rows
+        self.cols = maze_gen.cols
+        self.cell_size = maze_gen.cell_size
+
+        self.maze_colour = maze_gen.maze_colour
+        self.wall_colour = maze_gen.wall_colour
+        self.backtrack_colour = maze_gen.backtrack_colour
+        self.bg_colour = maze_gen.bg_colour
+        self.search_colour = maze_gen.search_colour
+        # RunStats the draw calls, screen updates and the time spent on them are added to
+        self.stats = maze_gen.stats
+
+        self.half_c_size = self.cell_size//2
+        # Line for the path through the maze
+        self.line_width = self.cell_size - (2*((self.cell_size//2)-1))
+
+        pygame.init()
+        self.window = pygame.display.set_mode((maze_gen.WINDOW_WIDTH, maze_gen.WINDOW_HEIGHT))
+        pygame.display.set_caption("Python Maze Generator")
+        self.clock = pygame.time.Clock()
+
+        # Rects drawn since the last flush, pushed to the screen together at most once per frame
+        self.dirty = []
+        self.frame_time = 1 / maze_gen.FPS
+        self.last_flush = 0
+        # Past this many rects one full screen update is cheaper than updating each of them
+        self.max_dirty = 500
+
+        # Optional display of the run's stats in the top left corner, redrawn a few times a second
+        self.hud = maze_gen.hud
+        self.hud_interval = 0.25
+        self.last_hud = 0
+        self.font = pygame.font.Font(None, 18) if self.hud else None
+
+    # converts the coordinates one cell width and height from the the top left corner
+    def cell_x(self, col):
+        return (col+1) * self.cell_size
+
+    def cell_y(self, row):
+        return (row+1) * self.cell_size
+
+    def set_caption(self, caption):
+        pygame.display.set_caption(caption)
+
+    # Flushes the drawn rects if a frame has passed since the last flush
+    def update(self):
+        if time.perf_counter() - self.last_flush >= self.frame_time:
+            self.flush()
+
+    # Pushes every rect drawn since the last flush to the screen
+    def flush(self):
+        start = time.perf_counter()
+        if self.hud and start - self.last_hud >= self.hud_interval:
+            self.draw_hud()
+        if len(self.dirty) > self.max_dirty:
+            self.display_update()
+        elif self.dirty:
+            self.display_update(self.dirty)
+        self.dirty = []
+        self.last_flush = time.perf_counter()
+        self.stats.display_time += self.last_flush - start
+
+    def display_update(self, rects=None):
+        self.stats.display_updates += 1
+        if rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+
+    # Draws the run's counters and timings over the top left of the maze
+    def draw_hud(self):
+        self.last_hud = time.perf_counter()
+        lines = [self.font.render(line, True, (255, 255, 255)) for line in self.stats.summary()]
+        width = max(line.get_width() for line in lines) + 8
+        height = sum(line.get_height() for line in lines) + 8
+        panel = pygame.Surface((width, height))
+        panel.fill((0, 0, 0))
+        y = 4
+        for line in lines:
+            panel.blit(line, (4, y))
+            y += line.get_height()
+        self.dirty.append(self.window.blit(panel, (0, 0)))
+
+    # Handles the window's events, returns True if it has been closed. Key presses are passed to on_key if given.
+    def window_closed(self, on_key=None):
+        closed = False
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                closed = True
+            elif event.type == pygame.KEYDOWN and on_key is not None:
+                on_key(event.key)
+        return closed
+
+    def check_closed(self):
+        if self.window_closed():
+            raise WindowClosed
+
+    def close(self):
+        pygame.display.quit()
+
+    # Draws all the walls for the maze
+    def draw_grid(self):
+        self.window.fill(self.bg_colour)
+        for i in range(self.rows+1):
+            pygame.draw.line(self.window, self.wall_colour, (self.cell_size, (i+1)*self.cell_size), (self.cell_size*(self.cols+1), (i+1)*self.cell_size))
+        for j in range(self.cols+1):
+            pygame.draw.line(self.window, self.wall_colour, ((j+1)*self.cell_size, self.cell_size), ((j+1)*self.cell_size, self.cell_size*(self.rows+1)))
+        self.dirty = []
+        self.display_update()
+
+    # Removes wall between a cell and the adjacent cell in the given direction
+    def open_side(self, row, col, direction):
+        x = self.cell_x(col)
+        y = self.cell_y(row)
+        if direction == UP:
+            rect = (x+1, y+1-self.cell_size, self.cell_size-1, (2*self.cell_size)-1)
+        elif direction == DOWN:
+            rect = (x+1, y+1, self.cell_size-1, (2*self.cell_size)-1)
+        elif direction == LEFT:
+            rect = (x+1-self.cell_size, y+1, (2*self.cell_size)-1, self.cell_size-1)
+        else:
+            rect = (x+1, y+1, (2*self.cell_size)-1, self.cell_size-1)
+        self.dirty.append(pygame.draw.rect(self.window, self.maze_colour, rect, 0))
+        self.stats.draw_calls += 1
+
+    # Flashes the cell which is considered
+    def show_cell(self, row, col):
+        self.dirty.append(pygame.draw.rect(self.window, self.backtrack_colour, (self.cell_x(col)+1, self.cell_y(row)+1, self.cell_size-1, self.cell_size-1), 0))
+        self.stats.draw_calls += 1
+
+    def cover_cell(self, row, col):
+        self.dirty.append(pygame.draw.rect(self.window, self.maze_colour, (self.cell_x(col)+1, self.cell_y(row)+1, self.cell_size-1, self.cell_size-1), 0))
+        self.stats.draw_calls += 1
+
+    # Returns a cell to the background colour, for cells which aren't part of the maze yet
+    def clear_cell(self, row, col):
+        self.dirty.append(pygame.draw.rect(self.window, self.bg_colour, (self.cell_x(col)+1, self.cell_y(row)+1, self.cell_size-1, self.cell_size-1), 0))
+        self.stats.draw_calls += 1
+
+    # Marks a cell which a solver has expanded
+    def search_cell(self, row, col):
+        self.dirty.append(pygame.draw.rect(self.window, self.search_colour, (self.cell_x(col)+1, self.cell_y(row)+1, self.cell_size-1, self.cell_size-1), 0))
+        self.stats.draw_calls += 1
+
+    # Draws one segment of the path through the maze, from the cell at (x, y) towards the given direction
+    def path_line(self, x, y, direction, colour):
+        if direction == UP:
+            rect = (x+self.half_c_size, y+self.half_c_size-self.cell_size, self.line_width, self.cell_size)
+        elif direction == DOWN:
+            rect = (x+self.half_c_size, y+self.half_c_size, self.line_width, self.cell_size)
+        elif direction == LEFT:
+            rect = (x+self.half_c_size-self.cell_size, y+self.half_c_size, self.cell_size+self.line_width, self.line_width)
+        else:
+            rect = (x+self.half_c_size, y+self.half_c_size, self.cell_size+self.line_width, self.line_width)
+        self.dirty.append(pygame.draw.rect(self.window, colour, rect, 0))
+        self.stats.draw_calls += 1
+        self.update()
+
+    # Draws a whole maze straight from its wall array, e.g. one which was generated headless
+    def draw_maze(self, maze):
+        self.draw_grid()
+        walls = maze.wall_grid
+        # Cells with no open sides aren't part of the maze yet and stay as background
+        for row, col in zip(*np.nonzero(walls)):
+            self.cover_cell(row, col)
+            if walls[row, col] & DOWN:
+                self.open_side(row, col, DOWN)
+            if walls[row, col] & RIGHT:
+                self.open_side(row, col, RIGHT)
+        self.dirty = []
+        self.display_update()
+
+    # Keeps the window open until it is closed
+    def wait_for_close(self, fps):
+        self.flush()
+        running = True
+        while running:
+            self.clock.tick(fps)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
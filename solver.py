@@ -0,0 +1,391 @@
+import argparse
+import heapq
+import sys
+import time
+from array import array
+
+import numpy as np
+
+import options
+from maze_core import Maze, UP, DOWN, LEFT, RIGHT, index_dtype, index_typecode
+
+
+# Breadth first search from one cell over the open sides of a Maze. Returns the distance of every cell from the
+# start (-1 where unreachable) and the cell each cell was reached from (the start is its own parent), as typed
+# arrays indexed by cell, and the cells in the order they were expanded. Given an end, the search stops as soon as
+# the end comes out of the queue, leaving the cells past it unreached.
+def bfs(maze, start, end=None):
+    cols = maze.cols
+    walls = maze.buffer
+    typecode = index_typecode(maze.size)
+    distance = array(typecode, [-1]) * maze.size
+    parent = array(typecode, [-1]) * maze.size
+    distance[start] = 0
+    parent[start] = start
+
+    # The visiting order doubles as the queue
+    order = [start]
+    append = order.append
+    for cell in order:
+        if cell == end:
+            del order[order.index(end) + 1:]
+            break
+        sides = walls[cell]
+        step = distance[cell] + 1
+        if sides & UP and distance[cell - cols] < 0:
+            distance[cell - cols] = step
+            parent[cell - cols] = cell
+            append(cell - cols)
+        if sides & DOWN and distance[cell + cols] < 0:
+            distance[cell + cols] = step
+            parent[cell + cols] = cell
+            append(cell + cols)
+        if sides & LEFT and distance[cell - 1] < 0:
+            distance[cell - 1] = step
+            parent[cell - 1] = cell
+            append(cell - 1)
+        if sides & RIGHT and distance[cell + 1] < 0:
+            distance[cell + 1] = step
+            parent[cell + 1] = cell
+            append(cell + 1)
+
+    return distance, parent, order
+
+
+# Follows a parent array back from the end to the start, giving the cells from the start to the end
+def trace(parent, start, end):
+    path = [end]
+    while path[-1] != start:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
+# Solves a maze from a fixed start cell. The search is done once, after which the distance to any cell is a lookup
+# and any path is read straight off the parent array.
+class Solver:
+    def __init__(self, maze, start=0):
+        self.maze = maze
+        self.start = start
+        self._distance, self._parent, _ = bfs(maze, start)
+
+        # numpy views of the same memory, e.g. for finding the furthest cell
+        self.distance = np.frombuffer(self._distance, dtype=index_dtype(maze.size))
+        self.parent = np.frombuffer(self._parent, dtype=self.distance.dtype)
+        self._perfect = None
+
+    # Number of moves from the start to the cell, -1 if it can't be reached
+    def length(self, end):
+        return self._distance[end]
+
+    # Cell indices from the start to the end, inclusive
+    def path(self, end):
+        if self._distance[end] < 0:
+            return None
+        return np.array(trace(self._parent, self.start, end), dtype=self.parent.dtype)
+
+    # Path between any two cells. In a perfect maze there's only one path, so it's found by climbing from both
+    # cells towards the start until they meet, otherwise a new search is done from the first cell.
+    def path_between(self, first, second):
+        if self._distance[first] < 0 or self._distance[second] < 0:
+            return Solver(self.maze, first).path(second)
+        if not self.is_perfect():
+            return Solver(self.maze, first).path(second)
+
+        distance = self._distance
+        parent = self._parent
+        head = [first]
+        tail = [second]
+        while distance[head[-1]] > distance[tail[-1]]:
+            head.append(parent[head[-1]])
+        while distance[tail[-1]] > distance[head[-1]]:
+            tail.append(parent[tail[-1]])
+        while head[-1] != tail[-1]:
+            head.append(parent[head[-1]])
+            tail.append(parent[tail[-1]])
+        tail.pop()
+        return np.array(head + tail[::-1], dtype=self.parent.dtype)
+
+    # A perfect maze has exactly one path between any two cells, so it has one fewer passage than cells
+    def is_perfect(self):
+        if self._perfect is None:
+            grid = self.maze.wall_grid
+            passages = np.count_nonzero(grid & DOWN) + np.count_nonzero(grid & RIGHT)
+            self._perfect = passages == self.maze.size - 1 and bool((self.distance >= 0).all())
+        return self._perfect
+
+
+# The solvers below find a path from one cell to another, counting the cells they expand along the way. Each returns
+# the path as a list of cell indices from the start to the end (None if there isn't one) and the expanded cells, in
+# the order they were expanded. solve and solve_batch time them and report on them.
+
+
+# Breadth first search which stops as soon as the end comes out of the queue
+def breadth_first(maze, start, end):
+    distance, parent, expanded = bfs(maze, start, end)
+    if distance[end] < 0:
+        return None, expanded
+    return trace(parent, start, end), expanded
+
+
+# A* with the Manhattan distance to the end as its heuristic, which never overestimates on a grid so the path is a
+# shortest one. Each heap entry is a single int, the estimated length above the moves left to make (so ties go to
+# the cell furthest along) above the cell index, so the heap only compares plain ints.
+def a_star(maze, start, end):
+    cols = maze.cols
+    size = maze.size
+    walls = maze.buffer
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    end_row, end_col = divmod(end, cols)
+    typecode = index_typecode(size)
+    parent = array(typecode, [-1]) * size
+    cost = array(typecode, [-1]) * size
+    closed = bytearray(size)
+    parent[start] = start
+    cost[start] = 0
+
+    shift = size.bit_length()
+    mask = (1 << shift) - 1
+    steps = ((UP, -cols), (DOWN, cols), (LEFT, -1), (RIGHT, 1))
+    row, col = divmod(start, cols)
+    heap = [((abs(row - end_row) + abs(col - end_col)) * (size + 1) + size) << shift | start]
+    expanded = []
+    while heap:
+        cell = heappop(heap) & mask
+        if closed[cell]:
+            continue
+        closed[cell] = 1
+        expanded.append(cell)
+        if cell == end:
+            return trace(parent, start, end), expanded
+
+        sides = walls[cell]
+        step = cost[cell] + 1
+        for side, offset in steps:
+            if sides & side:
+                neighbour = cell + offset
+                if not closed[neighbour] and (cost[neighbour] < 0 or step < cost[neighbour]):
+                    cost[neighbour] = step
+                    parent[neighbour] = cell
+                    row, col = divmod(neighbour, cols)
+                    estimate = step + abs(row - end_row) + abs(col - end_col)
+                    heappush(heap, (estimate * (size + 1) + size - step) << shift | neighbour)
+    return None, expanded
+
+
+# Number of open sides for each value of a cell's byte
+OPEN_SIDES = np.array([bin(sides).count('1') for sides in range(16)], dtype=np.uint8)
+
+
+# Fills in dead ends with whole-array operations until none are left. 'walls' is the flat wall array of one maze,
+# or of several mazes of the same size one after another, which are all filled at once. Every round fills all the
+# current dead ends, cells with one open side which aren't in 'keep', closing the side of the cell each one opened
+# onto, which may make that a dead end for the next round. Returns what's left of the walls and the filled cells
+# in the order they were filled.
+def fill_dead_ends(walls, cols, keep, min_round=32):
+    walls = np.array(walls, dtype=np.uint8)
+    offsets = np.zeros(16, dtype=np.int64)
+    offsets[[UP, DOWN, LEFT, RIGHT]] = (-cols, cols, -1, 1)
+    closing = np.zeros(16, dtype=np.uint8)
+    closing[[UP, DOWN, LEFT, RIGHT]] = (~np.uint8(DOWN), ~np.uint8(UP), ~np.uint8(RIGHT), ~np.uint8(LEFT))
+    kept = np.zeros(len(walls), dtype=bool)
+    kept[keep] = True
+    filled = np.zeros(len(walls), dtype=bool)
+
+    rounds = []
+    dead_ends = np.flatnonzero((OPEN_SIDES[walls] == 1) & ~kept)
+    # Long dead ends leave only a few cells to fill each round, where the cost of a round is all overhead, so
+    # they're finished off one cell at a time instead
+    while len(dead_ends) >= min_round:
+        rounds.append(dead_ends)
+        filled[dead_ends] = True
+        sides = walls[dead_ends]
+        neighbours = dead_ends + offsets[sides]
+        walls[dead_ends] = 0
+        # Two dead ends can open onto the same cell, so the closing is done unbuffered
+        np.bitwise_and.at(walls, neighbours, closing[sides])
+        neighbours = np.unique(neighbours)
+        dead_ends = neighbours[(OPEN_SIDES[walls[neighbours]] == 1) & ~kept[neighbours] & ~filled[neighbours]]
+
+    order = np.concatenate(rounds).tolist() if rounds else []
+    if len(dead_ends):
+        order += fill_one_by_one(walls, dead_ends.tolist(), offsets.tolist(), closing.tolist(), kept)
+    return walls, np.array(order, dtype=np.int64)
+
+
+# Fills dead ends one cell at a time, carrying on along each dead end until it reaches a junction
+def fill_one_by_one(walls, dead_ends, offsets, closing, kept):
+    buffer = bytearray(walls.tobytes())
+    kept = bytearray(kept.tobytes())
+    open_sides = OPEN_SIDES.tolist()
+    order = []
+    for cell in dead_ends:
+        while open_sides[buffer[cell]] == 1 and not kept[cell]:
+            order.append(cell)
+            side = buffer[cell]
+            buffer[cell] = 0
+            cell += offsets[side]
+            buffer[cell] &= closing[side]
+    walls[:] = np.frombuffer(buffer, dtype=np.uint8)
+    return order
+
+
+# Dead end filling, which leaves only the cells on a path between the start and the end. In a perfect maze that's
+# the one path, which a breadth first search over what's left reads off, with its expansions counted as well.
+def dead_end_filling(maze, start, end):
+    walls, filled = fill_dead_ends(maze.walls, maze.cols, [start, end])
+    return path_left(walls, maze.rows, maze.cols, start, end, filled.tolist())
+
+
+# Searches the cells left after dead end filling for the path, the filled cells come first in the expanded cells
+def path_left(walls, rows, cols, start, end, filled):
+    rest = Maze(rows, cols)
+    rest.walls[:] = walls
+    path, expanded = breadth_first(rest, start, end)
+    return path, filled + expanded
+
+
+# The sides in clockwise order, so turning right is one step on and turning left one step back
+CLOCKWISE = (UP, RIGHT, DOWN, LEFT)
+
+
+# Keeps one hand on the wall, turning towards that hand whenever it can. That finds the way through any perfect
+# maze, going down each passage at most twice. Walking straight back the way it came is taken off the path, so
+# what's left is the path without the detours. Gives up after 4 moves per cell, as it can go round in circles
+# forever in a maze with loops.
+def wall_follower(maze, start, end, right_hand=True):
+    cols = maze.cols
+    walls = maze.buffer
+    offsets = (-cols, 1, cols, -1)
+    turns = (1, 0, 3, 2) if right_hand else (3, 0, 1, 2)
+
+    heading = 0
+    cell = start
+    path = [start]
+    expanded = [start]
+    for _ in range(4 * maze.size):
+        if cell == end:
+            return path, expanded
+        sides = walls[cell]
+        for turn in turns:
+            direction = (heading + turn) % 4
+            if sides & CLOCKWISE[direction]:
+                break
+        else:
+            # Nowhere to go from a cell with no open sides
+            return None, expanded
+
+        heading = direction
+        cell += offsets[direction]
+        expanded.append(cell)
+        if len(path) > 1 and path[-2] == cell:
+            path.pop()
+        else:
+            path.append(cell)
+    return None, expanded
+
+
+# Keyed by the names in options.SOLVERS, which the command lines offer without importing this module
+SOLVERS = dict(zip(options.SOLVERS, (breadth_first, a_star, dead_end_filling, wall_follower)))
+
+
+# Solves a maze with one of the SOLVERS, from the top left to the bottom right cell unless told otherwise. Returns a
+# report of the path, its length in moves, the number of cells expanded, in order, and the time it took.
+def solve(maze, solver='bfs', start=0, end=None):
+    if end is None:
+        end = maze.size - 1
+    begin = time.perf_counter()
+    path, expanded = SOLVERS[solver](maze, start, end)
+    seconds = time.perf_counter() - begin
+    return report(maze, solver, path, expanded, seconds)
+
+
+def report(maze, solver, path, expanded, seconds):
+    dtype = index_dtype(maze.size)
+    return {
+        'solver': solver,
+        'rows': maze.rows,
+        'cols': maze.cols,
+        'length': None if path is None else len(path) - 1,
+        'nodes_expanded': len(expanded),
+        'seconds': seconds,
+        'path': None if path is None else np.array(path, dtype=dtype),
+        'expanded': np.array(expanded, dtype=dtype),
+    }
+
+
+# Solves every maze with every solver given, returning one report per maze and solver in that order, with the
+# index of the maze in the list added as 'maze'. Dead end filling does all the mazes of the same size in a single
+# set of whole-array rounds, and each of those mazes reports an equal share of the time the rounds took. The paths
+# and expanded cells are dropped unless keep_paths is set, so large batches don't hold on to them.
+def solve_batch(mazes, solvers=tuple(SOLVERS), start=0, end=None, keep_paths=False):
+    mazes = list(mazes)
+    reports = [None] * (len(mazes) * len(solvers))
+    for j, solver in enumerate(solvers):
+        if solver == 'dead_end':
+            solved = solve_dead_ends_together(mazes, start, end)
+        else:
+            solved = [solve(maze, solver, start, end) for maze in mazes]
+        for i, result in enumerate(solved):
+            result['maze'] = i
+            if not keep_paths:
+                del result['path'], result['expanded']
+            reports[i * len(solvers) + j] = result
+    return reports
+
+
+# Dead end filling for many mazes, grouping the ones of the same size and filling each group at once
+def solve_dead_ends_together(mazes, start, end):
+    groups = {}
+    for i, maze in enumerate(mazes):
+        groups.setdefault((maze.rows, maze.cols), []).append(i)
+
+    reports = [None] * len(mazes)
+    for (rows, cols), members in groups.items():
+        size = rows * cols
+        last = size - 1 if end is None else end
+        firsts = np.arange(len(members), dtype=np.int64) * size
+        begin = time.perf_counter()
+        walls, filled = fill_dead_ends(np.concatenate([mazes[i].walls for i in members]), cols,
+                                       np.concatenate((firsts + start, firsts + last)))
+        # Filled cells in the order they were filled, split up by maze
+        owner = filled // size
+        order = np.argsort(owner, kind='stable')
+        bounds = np.searchsorted(owner[order], np.arange(len(members) + 1))
+        share = (time.perf_counter() - begin) / len(members)
+
+        for k, i in enumerate(members):
+            begin = time.perf_counter()
+            own = (filled[order[bounds[k]:bounds[k + 1]]] - firsts[k]).tolist()
+            path, expanded = path_left(walls[k * size:(k + 1) * size], rows, cols, start, last, own)
+            reports[i] = report(mazes[i], 'dead_end', path, expanded, share + time.perf_counter() - begin)
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the solvers on a batch of generated mazes")
+    parser.add_argument('rows', type=options.positive_int)
+    parser.add_argument('cols', type=options.positive_int)
+    parser.add_argument('--algorithm', default="Depth First")
+    parser.add_argument('--count', type=options.positive_int, default=10, help="number of mazes, seeded 0, 1, 2, ...")
+    parser.add_argument('--solvers', nargs='+', default=tuple(SOLVERS), choices=tuple(SOLVERS))
+    args = parser.parse_args(argv)
+
+    from maze_generator import MazeGenerator
+
+    mazes = [MazeGenerator(args.rows, args.cols, 1, args.algorithm, headless=True, seed=seed).generate()
+             for seed in range(args.count)]
+    reports = solve_batch(mazes, args.solvers)
+    print(f"{args.count} {args.rows}x{args.cols} {args.algorithm} mazes")
+    for solver in args.solvers:
+        own = [result for result in reports if result['solver'] == solver]
+        solved = [result for result in own if result['length'] is not None]
+        expanded = sum(result['nodes_expanded'] for result in own) / len(own)
+        seconds = sum(result['seconds'] for result in own) / len(own)
+        print(f"{solver:<14} solved {len(solved):>5}/{len(own):<5} {expanded:>12,.0f} expanded "
+              f"{seconds * 1000:>10.3f} ms per maze")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
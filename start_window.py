@@ -1,5 +1,7 @@
 import tkinter as tk
 
+from options import ALGORITHMS
+
 class Window:
     def __init__(self):
         # Only starts maze if 'launch' is pressed
@@ -18,7 +20,7 @@ class Window:
         self.min_cell_size = 4
 
         # Available maze creating algorithms
-        self.algorithms = ("Depth First", "Primm's", "Binary Tree", "Hunt and Kill", "Sidewinder", "Eller's")
+        self.algorithms = ALGORITHMS
         self.chosen_algorithm = self.algorithms[0]
 
         self.maze_window_width = (self.maze_cols+2) * self.maze_cell_size        
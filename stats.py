@@ -0,0 +1,80 @@
+import time
+from array import array
+
+# What a generation run spends its time on. The sleeps, event polling and screen updates are timed where they
+# happen, and everything else the run does counts as compute.
+COUNTERS = ('cells_visited', 'backtracks', 'hunt_steps', 'set_merges', 'draw_calls', 'display_updates', 'frames',
+            'late_frames')
+TIMERS = ('sleep_time', 'event_time', 'display_time')
+
+
+# Counters and timers for one run of an algorithm, shared by the algorithm, the engines and the renderer
+class RunStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        for counter in COUNTERS:
+            setattr(self, counter, 0)
+        for timer in TIMERS:
+            setattr(self, timer, 0.0)
+        self.started = None
+        self.total_time = 0.0
+        # Length of every paced frame, late frames being the ones whose work took longer than a frame on its own
+        self.frame_times = array('d')
+
+    # Starts timing a new run, from zero
+    def start(self):
+        self.reset()
+        self.started = time.perf_counter()
+
+    def stop(self):
+        self.total_time = self.elapsed()
+        self.started = None
+
+    # Seconds since the run started, or the length of the whole run once it's stopped
+    def elapsed(self):
+        if self.started is None:
+            return self.total_time
+        return time.perf_counter() - self.started
+
+    def add_frame(self, seconds, late):
+        self.frames += 1
+        self.late_frames += late
+        self.frame_times.append(seconds)
+
+    # Mean, 95th percentile and longest frame time, None when there haven't been any frames
+    def frame_summary(self):
+        if not self.frame_times:
+            return None
+        times = sorted(self.frame_times)
+        return sum(times) / len(times), times[int(len(times) * 0.95)], times[-1]
+
+    def compute_time(self):
+        return max(self.elapsed() - self.sleep_time - self.event_time - self.display_time, 0.0)
+
+    def as_dict(self):
+        record = {counter: getattr(self, counter) for counter in COUNTERS}
+        record.update({timer: getattr(self, timer) for timer in TIMERS})
+        record['compute_time'] = self.compute_time()
+        record['total_time'] = self.elapsed()
+        frame_times = self.frame_summary()
+        if frame_times is not None:
+            record['frame_time_mean'], record['frame_time_p95'], record['frame_time_max'] = frame_times
+        return record
+
+    # Short lines of text for the on screen display
+    def summary(self):
+        lines = [
+            f"visited {self.cells_visited}  backtracks {self.backtracks}  hunts {self.hunt_steps}  "
+            f"merges {self.set_merges}",
+            f"draws {self.draw_calls}  updates {self.display_updates}",
+            f"compute {self.compute_time():.2f}s  sleep {self.sleep_time:.2f}s  events {self.event_time:.2f}s  "
+            f"display {self.display_time:.2f}s",
+        ]
+        frame_times = self.frame_summary()
+        if frame_times is not None:
+            mean, p95, longest = frame_times
+            lines.append(f"frames {self.frames}  late {self.late_frames}  mean {mean * 1000:.1f}ms  "
+                         f"p95 {p95 * 1000:.1f}ms  max {longest * 1000:.1f}ms")
+        return lines
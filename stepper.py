@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+
+# Runs a maze generator's algorithm a few steps at a time, for hosts which have their own loop. The host decides how
+# many steps to run or how long to spend each frame, and the algorithm doesn't pause between steps itself. Closing
+# the window, or calling cancel, stops the algorithm part way through without exiting.
+class Stepper:
+    def __init__(self, maze_gen):
+        self.maze_gen = maze_gen
+        self.renderer = maze_gen.renderer
+        maze_gen.algorithm.wait_time = 0
+        self.iterator = maze_gen.algorithm.steps()
+
+        self.steps_taken = 0
+        self.finished = False
+        self.cancelled = False
+        if self.renderer is not None:
+            self.renderer.draw_grid()
+        maze_gen.stats.start()
+
+    # Runs up to 'count' steps, returns False once the algorithm has finished or been cancelled
+    def advance(self, count=1):
+        if not self.ready():
+            return False
+        try:
+            for _ in range(count):
+                next(self.iterator)
+                self.steps_taken += 1
+        except StopIteration:
+            self.finish()
+            return False
+
+        if self.renderer is not None:
+            self.renderer.update()
+        return True
+
+    # Runs steps until 'seconds' have passed, returns False once the algorithm has finished or been cancelled. The
+    # window is only polled once per call, as that costs far more than a step.
+    def advance_for(self, seconds):
+        if not self.ready():
+            return False
+        clock = time.perf_counter
+        end = clock() + seconds
+        iterator = self.iterator
+        try:
+            while True:
+                next(iterator)
+                self.steps_taken += 1
+                if clock() >= end:
+                    break
+        except StopIteration:
+            self.finish()
+            return False
+
+        if self.renderer is not None:
+            self.renderer.update()
+        return True
+
+    # Polls the window at the start of each advance, timed as event handling like Algorithm.check_closed. Returns
+    # False if the algorithm has finished, or the window has been closed which cancels it.
+    def ready(self):
+        if self.finished:
+            return False
+        if self.renderer is not None:
+            start = time.perf_counter()
+            closed = self.renderer.window_closed()
+            self.maze_gen.stats.event_time += time.perf_counter() - start
+            if closed:
+                self.cancel()
+                return False
+        return True
+
+    def cancel(self):
+        if not self.finished:
+            self.iterator.close()
+            self.cancelled = True
+            self.finish()
+
+    def finish(self):
+        self.finished = True
+        if self.renderer is not None:
+            self.renderer.flush()
+        self.maze_gen.finish_stats()
+
+    # Runs the algorithm to the end from inside an asyncio event loop
+    async def run(self, steps_per_tick=10, tick=1/60):
+        await drive([self], steps_per_tick, tick)
+        return self.maze_gen.maze
+
+
+# Advances several steppers together, 'steps_per_tick' steps each every tick, handing control back to the event loop
+# between ticks. Only one of them can have a window, the rest should be headless.
+async def drive(steppers, steps_per_tick=10, tick=1/60):
+    steppers = list(steppers)
+    try:
+        while not all(stepper.finished for stepper in steppers):
+            start = time.perf_counter()
+            for stepper in steppers:
+                stepper.advance(steps_per_tick)
+            await asyncio.sleep(max(tick - (time.perf_counter() - start), 0))
+    except asyncio.CancelledError:
+        # Cancelling the task stops every maze it was advancing
+        for stepper in steppers:
+            stepper.cancel()
+        raise
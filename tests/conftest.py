@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# The modules sit at the top of the repository rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Makes seeded mazes headless, for the tests which need a maze to work on
+@pytest.fixture
+def make_maze():
+    from maze_generator import MazeGenerator
+
+    def make(rows, cols, algorithm="Kruskal's", seed=1):
+        return MazeGenerator(rows, cols, 1, algorithm, headless=True, seed=seed).generate()
+    return make
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from batch import generate_batch, read_batch
+from maze_generator import MazeGenerator
+from options import ALGORITHMS
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_batch_matches_headless_generation(tmp_path, algorithm):
+    path = str(tmp_path / 'mazes.mzb')
+    report = generate_batch(path, algorithm, 7, 11, 6, first_seed=5, processes=1)
+    assert report['mazes'] == 6
+
+    read = list(read_batch(path))
+    assert [seed for seed, _ in read] == list(range(5, 11))
+    for seed, maze in read:
+        expected = MazeGenerator(7, 11, 1, algorithm, headless=True, seed=seed).generate()
+        assert (maze.rows, maze.cols) == (7, 11)
+        assert np.array_equal(maze.walls, expected.walls)
+
+
+def test_batch_is_the_same_across_processes(tmp_path):
+    one = tmp_path / 'one.mzb'
+    two = tmp_path / 'two.mzb'
+    generate_batch(str(one), "Primm's", 9, 10, 20, processes=1)
+    generate_batch(str(two), "Primm's", 9, 10, 20, processes=2, chunksize=3)
+    assert one.read_bytes() == two.read_bytes()
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / 'other.mzb'
+    path.write_bytes(b'not a batch file')
+    with pytest.raises(ValueError):
+        list(read_batch(str(path)))
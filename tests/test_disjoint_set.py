@@ -0,0 +1,43 @@
+import math
+import random
+
+from disjoint_set import DisjointSet
+
+
+def test_union_and_find():
+    sets = DisjointSet(6)
+    assert sets.sets == 6
+    assert [sets.find(item) for item in range(6)] == list(range(6))
+
+    assert sets.union(0, 1)
+    assert sets.union(2, 3)
+    assert sets.union(1, 3)
+    assert not sets.union(0, 2)
+    assert not sets.union(4, 4)
+    assert sets.sets == 3
+    assert len({sets.find(item) for item in range(4)}) == 1
+    assert sets.find(4) == 4 and sets.find(5) == 5
+    assert sets.find(0) != sets.find(5)
+
+
+# Random unions against sets of items merged by hand, which union must agree with on whether each one joined two
+# sets, with the union by rank keeping every tree no deeper than log2 of its size
+def test_matches_merging_by_hand():
+    rng = random.Random(0)
+    size = 300
+    sets = DisjointSet(size)
+    members = {item: {item} for item in range(size)}
+    for _ in range(1000):
+        first, second = rng.randrange(size), rng.randrange(size)
+        separate = members[first] is not members[second]
+        assert sets.union(first, second) == separate
+        if separate:
+            joined = members[first] | members[second]
+            for item in joined:
+                members[item] = joined
+        assert sets.sets == len({id(group) for group in members.values()})
+
+    roots = [sets.find(item) for item in range(size)]
+    for item in range(size):
+        assert {other for other in range(size) if roots[other] == roots[item]} == members[item]
+    assert max(sets.rank) <= math.log2(size)
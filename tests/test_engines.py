@@ -0,0 +1,89 @@
+import io
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import engines
+from maze_core import Maze, UP
+from maze_random import MazeRandom
+from solver import Solver
+
+# Chi-squared critical value for 14 degrees of freedom at p = 0.001
+CHI_SQUARED_14 = 36.12
+
+
+# How often each maze comes up in 'count' mazes from one random stream, keyed by the maze's bytes
+def frequencies(engine, rows, cols, count, seed=0):
+    rng = MazeRandom(seed)
+    return Counter(bytes(engine(Maze(rows, cols), rng=rng).buffer) for _ in range(count))
+
+
+def chi_squared(counts, kinds, count):
+    expected = count / kinds
+    missing = kinds - len(counts)
+    return sum((seen - expected) ** 2 / expected for seen in counts.values()) + missing * expected
+
+
+# A 2x3 grid has 15 spanning trees, and Wilson's algorithm picks each of them with the same chance. Kruskal's,
+# which doesn't, is there to show the test can tell the difference.
+def test_wilsons_gives_every_spanning_tree_the_same_chance():
+    count = 15 * 200
+    counts = frequencies(engines.wilsons, 2, 3, count)
+    assert len(counts) == 15
+    for walls in counts:
+        maze = Maze(2, 3)
+        maze.buffer[:] = walls
+        assert Solver(maze, 0).is_perfect()
+    assert chi_squared(counts, 15, count) < CHI_SQUARED_14
+
+
+def test_kruskals_is_biased():
+    count = 15 * 200
+    assert chi_squared(frequencies(engines.kruskals, 2, 3, count), 15, count) > CHI_SQUARED_14
+
+
+# Stacks the rows of a stream into a maze, with the last row from finalize
+def stream_maze(cols, rows_before, seed):
+    stream = engines.EllersStream(cols, MazeRandom(seed))
+    rows = [stream.next_row() for _ in range(rows_before)] + [stream.finalize()]
+    maze = Maze(len(rows), cols)
+    maze.wall_grid[:] = np.array(rows)
+    return maze
+
+
+# finalize closes the maze off as a perfect maze whichever row it's called at, including straight away
+@pytest.mark.parametrize('rows_before', [0, 1, 2, 17])
+@pytest.mark.parametrize('cols', [1, 2, 9])
+def test_ellers_stream_finalizes_at_any_row(rows_before, cols):
+    for seed in range(5):
+        maze = stream_maze(cols, rows_before, seed)
+        assert maze.rows == rows_before + 1
+        assert Solver(maze, 0).is_perfect(), seed
+        assert not (maze.wall_grid[0] & UP).any()
+        expected = engines.ellers(Maze(rows_before + 1, cols), rng=MazeRandom(seed))
+        assert np.array_equal(maze.walls, expected.walls)
+
+
+def test_ellers_stream_ends_at_finalize():
+    stream = engines.EllersStream(4, MazeRandom(0))
+    assert len(list(zip(range(3), stream))) == 3
+    stream.finalize()
+    assert stream.rows_made == 4
+    assert list(stream) == []
+    with pytest.raises(ValueError):
+        stream.next_row()
+    with pytest.raises(ValueError):
+        stream.finalize()
+
+
+def test_write_ellers_round_trip():
+    file = io.BytesIO()
+    engines.write_ellers(file, 23, 11, MazeRandom(6))
+    data = file.getvalue()
+    assert len(data) == 23 * 11
+
+    maze = Maze(23, 11)
+    maze.walls[:] = np.frombuffer(data, dtype=np.uint8)
+    assert Solver(maze, 0).is_perfect()
+    assert np.array_equal(maze.walls, engines.ellers(Maze(23, 11), rng=MazeRandom(6)).walls)
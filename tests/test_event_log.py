@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from event_log import EventLog, CARVE, FLASH, MARK
+from maze_generator import MazeGenerator
+from options import ALGORITHMS
+from player import Player
+
+
+# Stands in for the Renderer, the player only needs somewhere to draw
+class StubRenderer:
+    def __getattr__(self, name):
+        return lambda *args: None
+
+
+class StubMazeGenerator:
+    def __init__(self):
+        self.renderer = StubRenderer()
+        self.FPS = 60
+
+
+def recorded(algorithm, rows=9, cols=13, seed=4):
+    maze_gen = MazeGenerator(rows, cols, 1, algorithm, headless=True, record=True, seed=seed)
+    return maze_gen.generate(), maze_gen.log
+
+
+def test_save_and_load_round_trip(tmp_path):
+    log = EventLog(3, 5)
+    log.carve(0, 8)
+    log.flash(1)
+    log.backtrack(2)
+    log.mark(14)
+    log.extend([CARVE, FLASH], [6, 7], [2, 0])
+    path = str(tmp_path / 'log.npz')
+    log.save(path)
+
+    loaded = EventLog.load(path)
+    assert (loaded.rows, loaded.cols) == (3, 5)
+    assert len(loaded) == len(log) == 6
+    assert np.array_equal(loaded.to_array(), log.to_array())
+    assert loaded.to_array()['op'].tolist() == [CARVE, FLASH, 2, MARK, CARVE, FLASH]
+
+
+def test_recorded_log_round_trip(tmp_path):
+    _, log = recorded("Hunt and Kill")
+    path = str(tmp_path / 'log.npz')
+    log.save(path)
+    assert np.array_equal(EventLog.load(path).to_array(), log.to_array())
+
+
+# The carves in the log, replayed one by one or all at once by seeking to the end, rebuild the generated maze
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_replaying_the_carves_gives_the_generated_maze(algorithm):
+    maze, log = recorded(algorithm)
+    events = log.to_array()
+    assert np.count_nonzero(events['op'] == CARVE) == maze.size - 1
+
+    player = Player(StubMazeGenerator(), log, 10)
+    for event in events:
+        player.apply(event)
+    assert np.array_equal(player.maze.walls, maze.walls)
+
+    player.seek(0)
+    assert not player.maze.walls.any()
+    player.seek(len(events))
+    assert np.array_equal(player.maze.walls, maze.walls)
+
+
+# At normal speed the whole log takes the duration it's given
+def test_player_speed_follows_the_duration():
+    _, log = recorded("Kruskal's", 20, 20)
+    assert Player(StubMazeGenerator(), log, 4).base_speed == len(log) / 4
+    assert Player(StubMazeGenerator(), log, 0.5).base_speed == len(log) / 0.5
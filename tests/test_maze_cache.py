@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+
+from maze_cache import MazeCache
+from maze_generator import MazeGenerator
+from solver import Solver
+
+
+def generate(cache, seed=3, algorithm="Depth First"):
+    maze_gen = MazeGenerator(12, 15, 1, algorithm, headless=True, seed=seed, cache=cache)
+    maze = maze_gen.generate()
+    return maze, maze_gen.solution
+
+
+def test_miss_then_hit(tmp_path):
+    cache = MazeCache(str(tmp_path))
+    maze, solution = generate(cache)
+    assert cache.stats()['misses'] == 1 and len(cache) == 1
+
+    cached, cached_solution = generate(cache)
+    assert cache.stats()['hits'] == 1
+    assert np.array_equal(cached.walls, maze.walls)
+    assert np.array_equal(cached_solution, solution)
+    assert np.array_equal(cached_solution, Solver(maze, 0).path(maze.size - 1))
+
+    # Opening the directory again finds the entry
+    assert ("Depth First", 12, 15, 3) in MazeCache(str(tmp_path))
+
+
+def test_keys_are_kept_apart(tmp_path):
+    cache = MazeCache(str(tmp_path))
+    generate(cache)
+    assert cache.get("Depth First", 12, 15, 4) is None
+    assert cache.get("Primm's", 12, 15, 3) is None
+    assert MazeCache(str(tmp_path), version=-1).get("Depth First", 12, 15, 3) is None
+    # Mazes without a seed are never cached
+    assert cache.get("Depth First", 12, 15, None) is None
+    generate(cache, seed=None)
+    assert len(cache) == 1
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    maze, _ = generate(None)
+    solution = Solver(maze, 0).path(maze.size - 1)
+    cache = MazeCache(str(tmp_path))
+    cache.put("Depth First", 12, 15, 0, maze, solution)
+    entry_bytes = cache.bytes
+    cache.max_bytes = entry_bytes * 2
+
+    cache.put("Depth First", 12, 15, 1, maze, solution)
+    assert cache.get("Depth First", 12, 15, 0) is not None
+    cache.put("Depth First", 12, 15, 2, maze, solution)
+
+    assert ("Depth First", 12, 15, 0) in cache
+    assert ("Depth First", 12, 15, 1) not in cache
+    assert ("Depth First", 12, 15, 2) in cache
+    assert cache.stats()['evictions'] == 1
+    assert cache.bytes == entry_bytes * 2
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_damaged_entry_is_dropped(tmp_path):
+    cache = MazeCache(str(tmp_path))
+    generate(cache)
+    name = cache.file_name("Depth First", 12, 15, 3)
+    with open(os.path.join(str(tmp_path), name), 'r+b') as file:
+        file.truncate(10)
+
+    assert cache.get("Depth First", 12, 15, 3) is None
+    assert len(cache) == 0
+    # Generating it again stores it again
+    generate(cache)
+    assert cache.get("Depth First", 12, 15, 3) is not None
@@ -0,0 +1,15 @@
+from array import array
+
+import numpy as np
+
+from maze_core import index_dtype, index_typecode
+
+
+# The array module and numpy types agree, so the typed arrays can be viewed as numpy arrays and back
+def test_index_types_agree():
+    for size in (1, 2**31 - 1, 2**31, 2**40):
+        dtype = np.dtype(index_dtype(size))
+        assert array(index_typecode(size)).itemsize == dtype.itemsize
+        assert np.iinfo(dtype).max >= size - 1
+    assert index_dtype(2**31 - 1) == np.int32
+    assert index_dtype(2**31) == np.int64
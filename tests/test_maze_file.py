@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+import engines
+from maze_core import Maze, UP, DOWN, LEFT, RIGHT
+from maze_file import MazeFile, save_maze, generate_ellers
+from maze_random import MazeRandom
+from solver import Solver, SOLVERS, solve
+
+
+# Sizes with rows that fill their bytes exactly, rows that don't, and single rows and columns
+@pytest.mark.parametrize('rows, cols', [(1, 1), (1, 9), (9, 1), (8, 8), (13, 17), (40, 33)])
+def test_saved_maze_reads_back_the_same(tmp_path, rows, cols, make_maze):
+    maze = make_maze(rows, cols)
+    path = str(tmp_path / 'saved.maze')
+    save_maze(path, maze)
+
+    maze_file = MazeFile(path)
+    assert (maze_file.rows, maze_file.cols) == (rows, cols)
+    assert np.array_equal(maze_file.to_maze().walls, maze.walls)
+    assert maze_file.parents is None and maze_file.solution is None
+
+
+def test_saved_solution_reads_back_the_same(tmp_path, make_maze):
+    maze = make_maze(20, 30)
+    solution = Solver(maze, 0).path(maze.size - 1)
+    path = str(tmp_path / 'saved.maze')
+    save_maze(path, maze, solution)
+
+    assert np.array_equal(MazeFile(path).solution, solution)
+
+
+def test_solve_matches_the_solver(tmp_path, make_maze):
+    maze = make_maze(25, 35, "Depth First")
+    path = str(tmp_path / 'solved.maze')
+    save_maze(path, maze)
+
+    solution = MazeFile(path, 'r+').solve()
+    expected = Solver(maze, 0).path(maze.size - 1)
+    assert np.array_equal(solution, expected)
+
+    # The parents and solution are in the file when it's opened again, and every cell's parent leads towards the end
+    maze_file = MazeFile(path)
+    assert np.array_equal(maze_file.solution, expected)
+    parents = np.asarray(maze_file.parents).ravel()
+    distance = Solver(maze, maze.size - 1).distance
+    steps = {UP: -maze.cols, DOWN: maze.cols, LEFT: -1, RIGHT: 1}
+    for cell in range(maze.size - 1):
+        assert distance[cell + steps[int(parents[cell])]] == distance[cell] - 1
+
+
+# Windows in the middle, against each edge, past the bottom right corner and covering the whole maze
+@pytest.mark.parametrize('top, left, rows, cols', [
+    (3, 7, 10, 9), (0, 0, 5, 5), (0, 11, 6, 20), (14, 0, 6, 4), (17, 29, 10, 10), (0, 0, 20, 31), (5, 5, 1, 1),
+])
+def test_region_matches_the_wall_grid(tmp_path, top, left, rows, cols, make_maze):
+    maze = make_maze(20, 31, "Wilson's")
+    path = str(tmp_path / 'region.maze')
+    save_maze(path, maze)
+
+    region, exits = MazeFile(path).read_region(top, left, rows, cols, exits=True)
+    expected = maze.wall_grid[top:top + rows, left:left + cols]
+    assert region.wall_grid.shape == expected.shape
+    assert np.array_equal(region.wall_grid | exits, expected)
+    assert not np.any(region.wall_grid & exits)
+
+    # Only the edges are closed off, the cells inside are just as they are in the maze
+    grid = region.wall_grid
+    assert not np.any(grid[0] & UP) and not np.any(grid[-1] & DOWN)
+    assert not np.any(grid[:, 0] & LEFT) and not np.any(grid[:, -1] & RIGHT)
+    assert np.array_equal(grid[1:-1, 1:-1], expected[1:-1, 1:-1])
+
+
+def test_every_solver_works_on_a_region(tmp_path, make_maze):
+    maze = make_maze(20, 31, "Binary Tree")
+    path = str(tmp_path / 'region.maze')
+    save_maze(path, maze)
+
+    region = MazeFile(path).read_region(3, 7, 10, 9)
+    expected = Solver(region, 0).path(region.size - 1)
+    for name in SOLVERS:
+        result = solve(region, name)
+        if expected is None:
+            assert result['path'] is None
+        else:
+            assert np.array_equal(result['path'], expected)
+
+
+def test_generate_ellers_matches_the_engine(tmp_path):
+    path = str(tmp_path / 'ellers.maze')
+    generate_ellers(path, 21, 13, seed=4, block_rows=4)
+
+    expected = engines.ellers(Maze(21, 13), rng=MazeRandom(4))
+    assert np.array_equal(MazeFile(path).to_maze().walls, expected.walls)
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / 'other.maze'
+    path.write_bytes(b'not a maze file' * 10)
+    with pytest.raises(ValueError):
+        MazeFile(str(path))
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+import metrics
+from maze_core import UP, DOWN, LEFT, RIGHT
+from options import ALGORITHMS
+from solver import Solver
+
+
+# The metrics worked out cell by cell with plain loops, to check the whole-array versions against
+
+def count_dead_ends(grid):
+    return sum(bin(int(sides)).count('1') == 1 for sides in grid.ravel())
+
+
+def count_turn_ratio(grid):
+    corridors = [int(sides) for sides in grid.ravel() if bin(int(sides)).count('1') == 2]
+    turns = [sides for sides in corridors if sides not in (UP | DOWN, LEFT | RIGHT)]
+    return len(turns) / len(corridors) if corridors else 0.0
+
+
+# Walks along each row and column, ending a corridor wherever the passage onwards is closed
+def count_runs(grid):
+    runs = []
+    for lines, side in ((grid, RIGHT), (grid.T, DOWN)):
+        for line in lines:
+            length = 1
+            for sides in line[:-1]:
+                if sides & side:
+                    length += 1
+                    continue
+                if length > 1:
+                    runs.append(length)
+                length = 1
+            if length > 1:
+                runs.append(length)
+    return sorted(runs)
+
+
+# The solution length and the longest path between any two cells, searching from every cell
+def search_every_cell(maze):
+    solution = int(Solver(maze, 0).length(maze.size - 1))
+    diameter = max(int(Solver(maze, cell).distance.max()) for cell in range(maze.size))
+    return solution, diameter
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+@pytest.mark.parametrize('rows, cols', [(1, 1), (1, 8), (8, 1), (9, 13)])
+def test_metrics_match_counting_by_hand(algorithm, rows, cols, make_maze):
+    for seed in range(3):
+        maze = make_maze(rows, cols, algorithm, seed)
+        grid = maze.wall_grid
+        assert metrics.dead_ends(grid) == count_dead_ends(grid)
+        assert metrics.turn_ratio(grid) == pytest.approx(count_turn_ratio(grid))
+        assert sorted(metrics.run_lengths(grid).tolist()) == count_runs(grid)
+        assert metrics.path_lengths(maze) == search_every_cell(maze)
+
+
+def test_a_stack_of_mazes_gives_one_value_each(make_maze):
+    mazes = [make_maze(10, 12, "Sidewinder", seed) for seed in range(5)]
+    stack = np.stack([maze.wall_grid for maze in mazes])
+    assert metrics.dead_ends(stack).tolist() == [metrics.dead_ends(maze.wall_grid) for maze in mazes]
+    assert metrics.turn_ratio(stack).tolist() == [metrics.turn_ratio(maze.wall_grid) for maze in mazes]
+    assert sorted(metrics.run_lengths(stack).tolist()) == sorted(
+        length for maze in mazes for length in metrics.run_lengths(maze.wall_grid).tolist())
+
+    results, runs = metrics.measure_mazes(mazes)
+    for maze, result in zip(mazes, results):
+        assert (result['solution_length'], result['diameter']) == search_every_cell(maze)
+        assert result['dead_ends'] == count_dead_ends(maze.wall_grid)
+
+
+@pytest.mark.parametrize('rows, cols', [(1, 1), (1, 8), (8, 1), (6, 6)])
+def test_sweep_sums_up_every_algorithm(rows, cols):
+    summary = metrics.sweep(ALGORITHMS, rows, cols, 5, processes=1, chunk=2)
+    assert [row['algorithm'] for row in summary] == list(ALGORITHMS)
+    for row in summary:
+        assert row['mazes'] == 5
+        assert sum(row['run_histogram']) == 0 or row['run_median'] <= row['run_p90'] <= row['run_max']
@@ -0,0 +1,18 @@
+import pytest
+
+from maze_generator import MazeGenerator
+from options import ALGORITHMS
+from stepper import Stepper
+
+
+# The Cell based steps, which animate the maze in the window, make the same maze from a seed as the headless engines
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+@pytest.mark.parametrize('rows, cols', [(1, 1), (1, 7), (7, 1), (6, 9), (23, 17)])
+def test_steps_make_the_same_maze_as_the_engine(algorithm, rows, cols):
+    for seed in range(3):
+        expected = MazeGenerator(rows, cols, 1, algorithm, headless=True, seed=seed).generate()
+        maze_gen = MazeGenerator(rows, cols, 1, algorithm, headless=True, seed=seed)
+        stepper = Stepper(maze_gen)
+        while stepper.advance(1000):
+            pass
+        assert bytes(maze_gen.maze.buffer) == bytes(expected.buffer), seed
@@ -0,0 +1,43 @@
+import argparse
+
+import pytest
+
+import batch
+import cli
+import solver
+from maze_generator import MazeGenerator
+from options import ALGORITHMS, SOLVERS, positive_int
+
+
+def test_algorithms_are_the_ones_the_generator_takes():
+    maze_gen = MazeGenerator(2, 2, 1, ALGORITHMS[0], headless=True)
+    assert set(maze_gen.algorithms) == set(ALGORITHMS)
+    assert len(ALGORITHMS) == len(set(ALGORITHMS))
+
+
+def test_solvers_are_the_ones_the_solver_takes():
+    assert tuple(solver.SOLVERS) == SOLVERS
+
+
+def test_positive_int():
+    assert positive_int('1') == 1
+    assert positive_int('250') == 250
+    for text in ('0', '-3', 'ten', '1.5'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            positive_int(text)
+
+
+@pytest.mark.parametrize('argv', [['0', '5'], ['5', '-1'], ['5', '5', '--cell-size', '0']])
+def test_cli_rejects_sizes_below_one(argv, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.parse_args(argv)
+    assert exit_info.value.code == 2
+    assert 'must be at least 1' in capsys.readouterr().err
+
+
+def test_batch_rejects_sizes_below_one(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        batch.main([str(tmp_path / 'mazes.mzb'), '--rows', '0'])
+    assert exit_info.value.code == 2
+    assert 'must be at least 1' in capsys.readouterr().err
+    assert not (tmp_path / 'mazes.mzb').exists()
@@ -0,0 +1,97 @@
+import pygame
+import pytest
+
+from maze_core import Maze
+from pacing import Pacer
+from renderer import WindowClosed
+from stats import RunStats
+
+
+# Stands in for the Renderer, pressing the given keys on the given frames and closing the window on 'close_at', so
+# a pacer which stalls ends the test rather than running forever
+class StubRenderer:
+    def __init__(self, keys=None, close_at=5000):
+        self.frames = 0
+        self.keys = keys or {}
+        self.close_at = close_at
+
+    def flush(self):
+        pass
+
+    def window_closed(self, on_key=None):
+        self.frames += 1
+        for key in self.keys.get(self.frames, ()):
+            on_key(key)
+        return self.frames == self.close_at
+
+
+class StubMazeGenerator:
+    def __init__(self, cells, renderer):
+        self.renderer = renderer
+        self.stats = RunStats()
+        self.maze = Maze(1, cells)
+
+
+# Keeps the target, rate, pause and steps taken at the end of every frame
+class RecordingPacer(Pacer):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.frames = []
+
+    def end_frame(self, start):
+        super().end_frame(start)
+        target = (self.played + self.frame_time * self.speed) / self.duration
+        self.frames.append((target, self.rate, self.paused, self.steps_taken, self.played))
+
+
+# Visits a new cell each step for the first 'visits' steps, then takes 'extra' steps which visit nothing, like
+# backtracking
+def steps(stats, visits, extra=0):
+    for _ in range(visits):
+        stats.cells_visited += 1
+        yield
+    for _ in range(extra):
+        yield
+
+
+# The steps stop visiting cells short of the whole maze, so the time runs out first. From then on the rate only
+# goes up, by at least the tail speed up each frame, until the steps run out. Before then it at most doubles each
+# frame.
+def test_rate_never_drops_once_the_time_is_up():
+    maze_gen = StubMazeGenerator(1000, StubRenderer())
+    pacer = RecordingPacer(maze_gen, 0.03, 1000)
+    pacer.run(steps(maze_gen.stats, 900, 2000))
+    assert pacer.steps_taken == 2900
+
+    rates = [rate for _, rate, _, _, _ in pacer.frames]
+    tail = [i for i, (target, _, _, _, _) in enumerate(pacer.frames) if target >= 1]
+    assert tail and tail == list(range(tail[0], len(pacer.frames)))
+    for before, after in zip(rates[tail[0]:], rates[tail[0] + 1:]):
+        assert after >= before * pacer.tail_speed_up
+    for before, after in zip(rates[:tail[0]], rates[1:tail[0]]):
+        assert 0 <= after <= before * 2 + 1
+
+
+# Space pauses the pacer, so no steps run and no time is played until it's pressed again
+def test_paused_stops_the_steps():
+    renderer = StubRenderer(keys={3: [pygame.K_SPACE], 10: [pygame.K_SPACE]}, close_at=15)
+    maze_gen = StubMazeGenerator(1000, renderer)
+    pacer = RecordingPacer(maze_gen, 1, 1000)
+    with pytest.raises(WindowClosed):
+        pacer.run(steps(maze_gen.stats, 1000))
+
+    assert [paused for _, _, paused, _, _ in pacer.frames] == [False] * 2 + [True] * 7 + [False] * 5
+    paused = pacer.frames[2:9]
+    assert len({(steps_taken, played) for _, _, _, steps_taken, played in paused}) == 1
+    assert pacer.frames[1][3] < paused[0][3]
+    assert pacer.frames[-1][3] > paused[-1][3]
+    assert maze_gen.stats.frames == 14
+
+
+def test_arrow_keys_change_the_speed():
+    renderer = StubRenderer(keys={1: [pygame.K_RIGHT, pygame.K_UP], 2: [pygame.K_LEFT]}, close_at=3)
+    maze_gen = StubMazeGenerator(100, renderer)
+    pacer = Pacer(maze_gen, 1, 1000)
+    with pytest.raises(WindowClosed):
+        pacer.run(steps(maze_gen.stats, 100))
+    assert pacer.speed == 2
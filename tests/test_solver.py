@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from maze_core import Maze, DIRECTIONS, OFFSETS
+from options import ALGORITHMS
+from solver import Solver, SOLVERS, bfs, solve, solve_batch, fill_dead_ends
+
+
+# A grid with every wall inside it knocked down, which has loops everywhere
+def open_grid(rows, cols):
+    maze = Maze(rows, cols)
+    for row in range(rows):
+        for col in range(cols):
+            if row < rows - 1:
+                maze.carve(row, col, DIRECTIONS[1])
+            if col < cols - 1:
+                maze.carve(row, col, DIRECTIONS[3])
+    return maze
+
+
+# Each move of the path goes through an open side into the cell next to it
+def assert_walkable(maze, path, start, end):
+    assert path[0] == start and path[-1] == end
+    for cell, following in zip(path[:-1], path[1:]):
+        row, col = maze.position(int(cell))
+        assert any(maze.buffer[int(cell)] & side and maze.index(row + OFFSETS[side][0], col + OFFSETS[side][1])
+                   == following for side in DIRECTIONS)
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+@pytest.mark.parametrize('rows, cols', [(1, 1), (1, 9), (9, 1), (15, 22)])
+def test_every_solver_finds_the_bfs_path(algorithm, rows, cols, make_maze):
+    for seed in range(3):
+        maze = make_maze(rows, cols, algorithm, seed)
+        rng = np.random.default_rng(seed)
+        pairs = [(0, maze.size - 1)] + [tuple(rng.integers(0, maze.size, 2).tolist()) for _ in range(3)]
+        for start, end in pairs:
+            expected = Solver(maze, start).path(end)
+            for name in SOLVERS:
+                result = solve(maze, name, start, end)
+                assert np.array_equal(result['path'], expected), (name, seed, start, end)
+                assert result['length'] == len(expected) - 1
+                assert result['nodes_expanded'] == len(result['expanded']) >= 1
+
+
+# Filling in whole-array rounds, one cell at a time or a mix of both leaves the same cells
+@pytest.mark.parametrize('algorithm', ["Depth First", "Hunt and Kill", "Wilson's", "Binary Tree"])
+def test_dead_end_filling_is_the_same_however_it_is_split(algorithm, make_maze):
+    maze = make_maze(40, 40, algorithm, 2)
+    keep = [0, maze.size - 1]
+    results = [fill_dead_ends(maze.walls, maze.cols, keep, min_round) for min_round in (1, 8, 32, maze.size + 1)]
+    walls, filled = results[0]
+    path = Solver(maze, 0).path(maze.size - 1)
+    assert set(range(maze.size)) - set(filled.tolist()) == set(path.tolist())
+    for other_walls, other_filled in results[1:]:
+        assert np.array_equal(other_walls, walls)
+        assert sorted(other_filled.tolist()) == sorted(filled.tolist())
+
+
+def test_shortest_paths_in_a_maze_with_loops():
+    maze = open_grid(9, 12)
+    end = maze.size - 1
+    for name in ('bfs', 'astar', 'dead_end'):
+        result = solve(maze, name)
+        assert result['length'] == 9 - 1 + 12 - 1
+        assert_walkable(maze, result['path'], 0, end)
+
+    # The wall follower can go round in circles, it either gives up or finds a path
+    result = solve(maze, 'wall_follower')
+    if result['path'] is not None:
+        assert_walkable(maze, result['path'], 0, end)
+
+
+# Stopping at the end expands the cells of the full search up to and including the end, in the same order, and
+# reaches them at the same distances
+def test_bfs_stops_at_the_end(make_maze):
+    maze = make_maze(16, 13, "Wilson's", 4)
+    distance, parent, order = bfs(maze, 0)
+    assert len(order) == maze.size
+    for end in (0, 1, maze.size // 2, maze.size - 1):
+        stopped_distance, stopped_parent, stopped_order = bfs(maze, 0, end)
+        assert stopped_order == order[:order.index(end) + 1]
+        for cell in stopped_order:
+            assert stopped_distance[cell] == distance[cell]
+            assert stopped_parent[cell] == parent[cell]
+        assert solve(maze, 'bfs', 0, end)['nodes_expanded'] == len(stopped_order)
+
+
+def test_is_perfect(make_maze):
+    assert Solver(make_maze(6, 7), 0).is_perfect()
+    assert not Solver(open_grid(6, 7), 0).is_perfect()
+    # As many passages as a perfect maze, but a loop round the left square leaves the right column cut off
+    maze = open_grid(2, 2)
+    wider = Maze(2, 3)
+    wider.wall_grid[:, :2] = maze.wall_grid
+    wider.carve(0, 2, DIRECTIONS[1])
+    assert not Solver(wider, 0).is_perfect()
+
+
+def test_no_path_between_cells_that_are_not_connected():
+    maze = Maze(3, 4)
+    maze.carve(0, 0, DIRECTIONS[3])
+    for name in SOLVERS:
+        assert solve(maze, name)['path'] is None
+
+
+def test_solve_batch_matches_solve(make_maze):
+    mazes = [make_maze(12, 12, "Primm's", seed) for seed in range(3)] + [make_maze(7, 20, "Kruskal's", 0)]
+    reports = solve_batch(mazes, keep_paths=True)
+    assert len(reports) == len(mazes) * len(SOLVERS)
+    for result in reports:
+        maze = mazes[result['maze']]
+        assert np.array_equal(result['path'], solve(maze, result['solver'])['path'])
+
+
+def test_path_between_any_two_cells(make_maze):
+    maze = make_maze(14, 11, "Eller's", 5)
+    solver = Solver(maze, 0)
+    rng = np.random.default_rng(0)
+    for first, second in rng.integers(0, maze.size, (20, 2)).tolist():
+        assert np.array_equal(solver.path_between(first, second), Solver(maze, first).path(second))
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from maze_generator import MazeGenerator
+from stepper import Stepper, drive
+
+
+# Stands in for the Renderer, counting how often the window is polled and closing it on request
+class StubRenderer:
+    def __init__(self):
+        self.polls = 0
+        self.closed = False
+
+    def window_closed(self):
+        self.polls += 1
+        return self.closed
+
+    def __getattr__(self, name):
+        return lambda *args: None
+
+
+def headless(rows=30, cols=30, algorithm="Depth First", seed=1):
+    return MazeGenerator(rows, cols, 1, algorithm, headless=True, seed=seed)
+
+
+# A headless maze generator drawing on a StubRenderer, so the steps run the same as in a window
+def with_stub_renderer(algorithm="Depth First"):
+    maze_gen = headless(algorithm=algorithm)
+    maze_gen.renderer = maze_gen.algorithm.renderer = StubRenderer()
+    return maze_gen
+
+
+def test_cancel_stops_part_way():
+    maze_gen = headless()
+    stepper = Stepper(maze_gen)
+    assert stepper.advance(10)
+    stepper.cancel()
+    assert stepper.cancelled and stepper.finished
+    assert stepper.steps_taken == 10
+    assert not stepper.advance(10)
+    assert not stepper.advance_for(1)
+    assert stepper.steps_taken == 10
+    assert maze_gen.stats_record['mode'] == 'headless'
+
+    # Cancelling again, or after the end, changes nothing
+    stepper.cancel()
+    finished = Stepper(headless(3, 3))
+    while finished.advance(100):
+        pass
+    finished.cancel()
+    assert finished.finished and not finished.cancelled
+
+
+def test_closing_the_window_cancels():
+    maze_gen = with_stub_renderer()
+    stepper = Stepper(maze_gen)
+    assert stepper.advance(5)
+    maze_gen.renderer.closed = True
+    assert not stepper.advance(5)
+    assert stepper.cancelled
+    assert stepper.steps_taken == 5
+
+
+def test_advance_for_runs_to_the_same_maze():
+    expected = headless().generate()
+    maze_gen = headless()
+    stepper = Stepper(maze_gen)
+    # No time at all still takes a step
+    assert stepper.advance_for(0)
+    assert stepper.steps_taken == 1
+    while stepper.advance_for(0.001):
+        pass
+    assert stepper.finished and not stepper.cancelled
+    assert bytes(maze_gen.maze.buffer) == bytes(expected.buffer)
+
+
+# The window is polled once per call however many steps it runs, and the polling is counted as event time
+def test_advance_for_polls_the_window_once():
+    maze_gen = with_stub_renderer()
+    stepper = Stepper(maze_gen)
+    calls = 0
+    while stepper.advance_for(0.002):
+        calls += 1
+    assert maze_gen.renderer.polls == calls + 1
+    assert stepper.steps_taken > calls + 1
+    assert maze_gen.stats.event_time > 0
+
+
+def test_cancelling_drive_cancels_every_stepper():
+    steppers = [Stepper(headless(seed=seed)) for seed in range(3)]
+
+    async def cancel_after_a_tick():
+        task = asyncio.ensure_future(drive(steppers, steps_per_tick=5, tick=0.001))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_after_a_tick())
+    for stepper in steppers:
+        assert stepper.cancelled and stepper.finished
+        assert 0 < stepper.steps_taken < 30 * 30
+
+
+def test_drive_runs_every_stepper_to_the_end():
+    makers = [("Primm's", 2), ("Wilson's", 3), ("Eller's", 4)]
+    steppers = [Stepper(headless(12, 14, algorithm, seed)) for algorithm, seed in makers]
+    asyncio.run(drive(steppers, steps_per_tick=50, tick=0))
+    for stepper, (algorithm, seed) in zip(steppers, makers):
+        assert stepper.finished and not stepper.cancelled
+        expected = headless(12, 14, algorithm, seed).generate()
+        assert bytes(stepper.maze_gen.maze.buffer) == bytes(expected.buffer)
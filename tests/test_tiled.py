@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from maze_generator import MazeGenerator
+from options import ALGORITHMS
+from solver import Solver
+from tiled import generate_tiled, tile_bounds
+
+
+def test_tile_bounds_cover_the_maze():
+    assert tile_bounds(10, 4) == [(0, 4), (4, 8), (8, 10)]
+    assert tile_bounds(3, 1) == [(0, 1), (1, 2), (2, 3)]
+    assert tile_bounds(5, 8) == [(0, 5)]
+
+
+# Tiles which don't divide the maze evenly, tiles a single row or column thick and tiles of a single cell, the
+# last of which leaves all the carving to the stitching
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+@pytest.mark.parametrize('tile_rows, tile_cols', [(4, 5), (7, 3), (1, 6), (5, 1), (1, 1), (30, 30)])
+def test_tiled_mazes_are_perfect(algorithm, tile_rows, tile_cols):
+    maze = generate_tiled(11, 13, algorithm, tile_rows, tile_cols, seed=3, processes=1)
+    assert (maze.rows, maze.cols) == (11, 13)
+    assert Solver(maze, 0).is_perfect()
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_thin_tiled_mazes_are_perfect(algorithm):
+    for rows, cols in [(1, 1), (1, 9), (9, 1)]:
+        maze = generate_tiled(rows, cols, algorithm, 2, 2, seed=0, processes=1)
+        assert Solver(maze, 0).is_perfect()
+
+
+# Each tile's seed is drawn before any work is handed out, so the pool doesn't change the maze
+@pytest.mark.parametrize('algorithm', ["Depth First", "Wilson's", "Eller's"])
+def test_tiled_mazes_are_the_same_across_processes(algorithm):
+    one = generate_tiled(40, 37, algorithm, 8, 9, seed=11, processes=1)
+    two = generate_tiled(40, 37, algorithm, 8, 9, seed=11, processes=2)
+    assert np.array_equal(one.walls, two.walls)
+    other = generate_tiled(40, 37, algorithm, 8, 9, seed=12, processes=1)
+    assert not np.array_equal(one.walls, other.walls)
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+@pytest.mark.parametrize('rows, cols', [(1, 1), (1, 2), (2, 1), (1, 17), (17, 1), (2, 2), (13, 8), (31, 40)])
+def test_headless_mazes_are_perfect(algorithm, rows, cols):
+    for seed in range(3):
+        maze = MazeGenerator(rows, cols, 1, algorithm, headless=True, seed=seed).generate()
+        assert Solver(maze, 0).is_perfect(), seed
@@ -0,0 +1,102 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+import engines
+from maze_core import Maze, DOWN, RIGHT, pack_walls, unpack_walls
+from maze_random import MazeRandom
+from options import positive_int
+from parallel import map_jobs
+
+# Giant mazes are split into tiles which are generated independently across a pool of processes, each as a perfect
+# maze of its own. The tiles are then joined by a random spanning tree over the grid of tiles, with one passage
+# carved through the seam for every edge of the tree. A tree of trees joined by single edges is itself a spanning
+# tree, so the result is still one perfect maze.
+
+
+# Generates one tile headless and returns its packed walls, run in the worker processes
+def generate_tile(job):
+    from maze_generator import MazeGenerator
+
+    algorithm, rows, cols, seed = job
+    maze = MazeGenerator(rows, cols, 1, algorithm, headless=True, seed=seed).generate()
+    return pack_walls(maze).tobytes()
+
+
+# Edges of the tiles, the last row and column of tiles take whatever is left over
+def tile_bounds(size, tile_size):
+    return [(start, min(start + tile_size, size)) for start in range(0, size, tile_size)]
+
+
+# Generates a rows x cols maze in tiles of at most tile_rows x tile_cols cells, with every tile made by 'algorithm'
+def generate_tiled(rows, cols, algorithm, tile_rows=1024, tile_cols=1024, seed=None, processes=None, chunksize=1):
+    rng = MazeRandom(seed)
+    row_bounds = tile_bounds(rows, tile_rows)
+    col_bounds = tile_bounds(cols, tile_cols)
+
+    # Each tile gets its own seed drawn from the maze's, so the same seed gives the same maze however many
+    # processes there are
+    tile_seeds = rng.generator.integers(0, 2**63, len(row_bounds) * len(col_bounds)).tolist()
+    jobs = []
+    for (top, bottom) in row_bounds:
+        for (left, right) in col_bounds:
+            jobs.append((algorithm, bottom - top, right - left, tile_seeds[len(jobs)]))
+
+    maze = Maze(rows, cols)
+    grid = maze.wall_grid
+    place_tiles(grid, map_jobs(generate_tile, jobs, processes, chunksize), row_bounds, col_bounds)
+
+    stitch(maze, row_bounds, col_bounds, rng)
+    return maze
+
+
+# Copies each tile into its place in the maze as it arrives
+def place_tiles(grid, tiles, row_bounds, col_bounds):
+    positions = ((top, bottom, left, right) for (top, bottom) in row_bounds for (left, right) in col_bounds)
+    for packed, (top, bottom, left, right) in zip(tiles, positions):
+        tile = unpack_walls(np.frombuffer(packed, dtype=np.uint8), bottom - top, right - left)
+        grid[top:bottom, left:right] = tile.wall_grid
+
+
+# Joins the tiles with one passage per edge of a random spanning tree over the grid of tiles, at a random point
+# along the seam between the two tiles
+def stitch(maze, row_bounds, col_bounds, rng):
+    tree = engines.primms(Maze(len(row_bounds), len(col_bounds)), rng=rng)
+    tree_grid = tree.wall_grid
+    for tile_row, tile_col in zip(*np.nonzero(tree_grid & DOWN)):
+        top, bottom = row_bounds[tile_row]
+        left, right = col_bounds[tile_col]
+        maze.carve(bottom - 1, left + rng.randrange(right - left), DOWN)
+    for tile_row, tile_col in zip(*np.nonzero(tree_grid & RIGHT)):
+        top, bottom = row_bounds[tile_row]
+        left, right = col_bounds[tile_col]
+        maze.carve(top + rng.randrange(bottom - top), right - 1, RIGHT)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a giant maze in tiles across a process pool")
+    parser.add_argument('rows', type=positive_int)
+    parser.add_argument('cols', type=positive_int)
+    parser.add_argument('--algorithm', default="Depth First")
+    parser.add_argument('--tile-size', type=positive_int, default=1024, help="rows and columns of each tile")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--processes', type=positive_int, default=None, help="defaults to the number of CPUs")
+    parser.add_argument('--output', default=None, help="maze file to save the maze to, see maze_file.py")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    maze = generate_tiled(args.rows, args.cols, args.algorithm, args.tile_size, args.tile_size, args.seed,
+                          args.processes)
+    seconds = time.perf_counter() - start
+    print(f"{args.rows}x{args.cols} {args.algorithm} maze in {seconds:.2f}s, "
+          f"{maze.size / seconds:.0f} cells/s")
+
+    if args.output is not None:
+        from maze_file import save_maze
+        save_maze(args.output, maze)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])